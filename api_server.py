@@ -3,26 +3,81 @@ Flask API Server with WebSocket
 Serves the web interface and provides real-time updates
 """
 
-from flask import Flask, jsonify, request, send_from_directory, send_file
+import os
+
+# Serving mode: "dev" runs the Werkzeug server, "eventlet" / "gevent" run an
+# async worker. Async libraries must patch the stdlib before anything else loads.
+SERVER_MODE = os.environ.get('SERVER_MODE', 'dev')
+if SERVER_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif SERVER_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, g, jsonify, request, send_from_directory, send_file
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
+import gzip
+import hashlib
 import json
-import os
+import math
+import platform
+import tempfile
+import zlib
 from datetime import datetime, timedelta
 from pathlib import Path
 import threading
 import time
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+from job_index import JobFilter, JobIndex, parse_timestamp
+from metrics import Registry, SamplingProfiler
+from trends import TrendIndex
+import exporters
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configuration
+JOBS_FILE = "jobs_data.json"
+# Shared queue (e.g. redis://localhost:6379/0) lets several workers broadcast
+# to each other's socket clients
+MESSAGE_QUEUE = os.environ.get('MESSAGE_QUEUE')
+BROADCAST_LOCK_FILE = ".broadcaster.lock"
+STATS_CACHE_TTL = 30  # seconds; "today"/"thisWeek" depend on the clock
+COMPRESSION_MIN_SIZE = 1024  # bytes; smaller bodies aren't worth compressing
+MONITOR_METRICS_FILE = "monitor_metrics.prom"  # written by monitor.py
+PROFILE_MIN_INTERVAL = 0.001  # seconds; faster sampling starves the server
+TREND_DEFAULT_SPAN = {'day': 30 * 86400, 'hour': 48 * 3600}  # seconds shown when no "from"
+ALL_JOBS_ROOM = "all_jobs"  # socket clients without a filter
+# Filter rooms are per worker: each worker matches jobs for its own clients
+FILTER_ROOM_PREFIX = f"filter:{platform.node()}:{os.getpid()}:"
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='.')
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode='threading' if SERVER_MODE == 'dev' else SERVER_MODE,
+    message_queue=MESSAGE_QUEUE,
+    http_compression=True,
+    compression_threshold=COMPRESSION_MIN_SIZE
+)
 
-# Configuration
-JOBS_FILE = "jobs_data.json"
 jobs_data = []
+job_index = JobIndex()
+trend_index = TrendIndex()
+# Digest of the jobs file, identical across restarts and workers
+data_version = hashlib.md5(b'').hexdigest()[:16]
 monitoring_status = {
     "is_running": False,
     "started_at": None,
@@ -30,82 +85,309 @@ monitoring_status = {
     "last_update": None
 }
 
+# Pre-serialized JSON bodies for hot endpoints, dropped whenever jobs reload
+response_cache = {}
+cache_lock = threading.Lock()
+is_broadcaster = True
+_broadcast_lock_handle = None
+
+# Socket clients with a server-side filter share one room per distinct filter
+subscriptions = {}  # room -> [JobFilter, member count]
+client_rooms = {}  # sid -> room
+subscriptions_lock = threading.Lock()
+
+# Metrics
+registry = Registry()
+REQUEST_SECONDS = registry.histogram(
+    'api_request_seconds', 'HTTP request latency', ['endpoint', 'method', 'status'])
+BROADCAST_SECONDS = registry.histogram(
+    'api_broadcast_seconds', 'Time to fan a jobs_updated broadcast out to socket clients')
+CONNECTED_CLIENTS = registry.gauge(
+    'api_connected_clients', 'Socket clients connected to this worker')
+JOBS_LOADED = registry.gauge(
+    'api_jobs_loaded', 'Jobs currently held in memory')
+FILTER_ROOMS = registry.gauge(
+    'api_filter_rooms', 'Distinct socket subscription filters on this worker')
+profiler = SamplingProfiler()
+
 class JobFileHandler(FileSystemEventHandler):
     """Watch for changes in jobs_data.json"""
     def on_modified(self, event):
         if event.src_path.endswith(JOBS_FILE):
             print(f"📝 Jobs file updated")
-            load_jobs()
-            # Notify all connected clients
-            socketio.emit('jobs_updated', {
-                'jobs': jobs_data,
-                'stats': get_stats()
-            })
+            try:
+                self.reload()
+            except Exception as e:
+                # An exception here would stop the observer thread for good
+                print(f"✗ Error handling jobs file update: {e}")
+
+    def reload(self):
+        if not is_broadcaster and claim_broadcaster():
+            # The previous broadcaster exited and released the lock
+            print("✓ Took over as broadcaster")
+        generation, known = job_index.generation, len(job_index)
+        if not load_jobs():
+            # Duplicate filesystem event, nothing new to send
+            return
+        # None means the file was rewritten rather than appended to
+        new_jobs = job_index.jobs[known:] if job_index.generation == generation else None
+        with BROADCAST_SECONDS.time():
+            broadcast_update(new_jobs)
 
 def load_jobs():
-    """Load jobs from JSON file"""
-    global jobs_data
+    """Load jobs from JSON file, returns True if the jobs changed
+
+    Whether anything changed is decided by the file digest, so edits that
+    keep every job id still reach the index, the caches and the ETags.
+    """
+    global jobs_data, data_version
+    raw = b''
     try:
         if Path(JOBS_FILE).exists():
-            with open(JOBS_FILE, 'r', encoding='utf-8') as f:
-                jobs_data = json.load(f)
-                monitoring_status['total_jobs'] = len(jobs_data)
-                monitoring_status['last_update'] = datetime.now().isoformat()
-                print(f"✓ Loaded {len(jobs_data)} jobs")
+            with open(JOBS_FILE, 'rb') as f:
+                raw = f.read()
         else:
-            jobs_data = []
             print("⚠ No jobs file found yet")
-    except Exception as e:
+    except OSError as e:
+        print(f"✗ Error loading jobs: {e}")
+    digest = hashlib.md5(raw).hexdigest()[:16]
+    if digest == data_version:
+        # Duplicate filesystem event for bytes we already serve
+        return False
+    try:
+        jobs = json.loads(raw) if raw else []
+    except ValueError as e:
         print(f"✗ Error loading jobs: {e}")
-        jobs_data = []
+        jobs = []
+    if raw:
+        monitoring_status['total_jobs'] = len(jobs)
+        monitoring_status['last_update'] = datetime.now().isoformat()
+        print(f"✓ Loaded {len(jobs)} jobs")
+    changed = job_index.sync(jobs)
+    trend_index.sync(job_index)
+    with cache_lock:
+        jobs_data = jobs
+        data_version = digest
+        response_cache.clear()
+    JOBS_LOADED.set(len(jobs_data))
+    return changed
 
-def get_stats():
-    """Calculate statistics from jobs"""
-    if not jobs_data:
-        return {
-            "total": 0,
-            "today": 0,
-            "thisWeek": 0,
-            "withImages": 0,
-            "byType": {}
+def preferred_encoding():
+    """Pick the best compression the client accepts"""
+    accepted = request.accept_encodings
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with the given content-coding"""
+    if encoding == 'br':
+        return brotli.compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+def gzip_stream(chunks):
+    """Gzip a stream of text chunks incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def stream_and_remove(path, chunk_size=64 * 1024):
+    """Open a temporary file, delete it and return a generator of its chunks
+
+    The open handle keeps the data readable after the unlink, so nothing is
+    left behind even if the client disconnects before the body is read.
+    """
+    f = open(path, 'rb')
+    try:
+        os.unlink(path)
+        unlinked = True
+    except OSError:  # Windows can't delete an open file
+        unlinked = False
+    
+    def chunks():
+        try:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            f.close()
+            if not unlinked:
+                os.unlink(path)
+    return chunks()
+
+def cached_json(key, build, ttl=None):
+    """Return a JSON response serialized (and compressed) once per data version
+
+    The ETag is derived from the body, so unchanged data answers 304.
+    """
+    now = time.time()
+    with cache_lock:
+        entry = response_cache.get(key)
+    if entry is None or (ttl is not None and now - entry['built_at'] > ttl):
+        body = json.dumps(build()).encode('utf-8')
+        entry = {
+            'built_at': now,
+            'etag': hashlib.md5(body).hexdigest(),
+            'identity': body
         }
+        with cache_lock:
+            response_cache[key] = entry
     
-    today = datetime.now().date()
-    week_ago = datetime.now() - timedelta(days=7)
+    if entry['etag'] in request.if_none_match:
+        response = app.response_class(status=304)
+        response.set_etag(entry['etag'])
+        return response
     
-    stats = {
-        "total": len(jobs_data),
-        "today": 0,
-        "thisWeek": 0,
-        "withImages": 0,
-        "byType": {}
-    }
-    
-    for job in jobs_data:
-        # Date-based counts
-        try:
-            job_date = datetime.fromisoformat(job['date']).date()
-            if job_date == today:
-                stats['today'] += 1
-            if datetime.fromisoformat(job['date']) >= week_ago:
-                stats['thisWeek'] += 1
-        except:
-            pass
-        
-        # Image count
-        if job.get('hasImage'):
-            stats['withImages'] += 1
-        
-        # Job type distribution
-        job_type = job.get('type', 'unknown')
-        stats['byType'][job_type] = stats['byType'].get(job_type, 0) + 1
+    encoding = preferred_encoding() if len(entry['identity']) >= COMPRESSION_MIN_SIZE else None
+    if encoding:
+        if encoding not in entry:
+            entry[encoding] = compress(entry['identity'], encoding)
+        response = app.response_class(entry[encoding], mimetype='application/json')
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = app.response_class(entry['identity'], mimetype='application/json')
+    response.set_etag(entry['etag'])
+    return response
+
+def claim_broadcaster():
+    """Elect a single worker to broadcast file updates over the message queue
+
+    The lock is held until the worker exits, so followers call this again
+    on later file updates and one of them takes over. Returns True if this
+    worker is the broadcaster.
+    """
+    global is_broadcaster, _broadcast_lock_handle
+    if not MESSAGE_QUEUE:
+        # Without a queue each worker only reaches its own clients
+        is_broadcaster = True
+        return True
+    if fcntl is None:
+        # Every worker would emit through the queue, so clients get N copies
+        raise RuntimeError("MESSAGE_QUEUE needs fcntl to elect one broadcaster; "
+                           "unset it or run the workers on a POSIX system")
+    handle = open(BROADCAST_LOCK_FILE, 'w')
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        _broadcast_lock_handle = handle
+        is_broadcaster = True
+    except OSError:
+        handle.close()
+        is_broadcaster = False
+    return is_broadcaster
+
+def broadcast_update(new_jobs):
+    """Push a jobs update to socket clients
+
+    Unfiltered clients get the full list (sent by the broadcaster only,
+    since it reaches every worker's clients). Each filter room gets just
+    the new jobs that match it, or a fresh snapshot if the file was rebuilt.
+    """
+    stats = get_stats()
+    if is_broadcaster:
+        socketio.emit('jobs_updated', {'jobs': jobs_data, 'stats': stats}, to=ALL_JOBS_ROOM)
+    with subscriptions_lock:
+        rooms = [(room, job_filter) for room, (job_filter, _) in subscriptions.items()]
+    for room, job_filter in rooms:
+        if new_jobs is None:
+            socketio.emit('filtered_data', {'jobs': job_filter.query(job_index), 'stats': stats}, to=room)
+        else:
+            matching = [job for job in new_jobs if job_filter.matches(job)]
+            socketio.emit('jobs_added', {'jobs': matching, 'stats': stats}, to=room)
+
+def subscribe_client(sid, job_filter):
+    """Move a socket client into the room for its filter (or the unfiltered room)"""
+    unsubscribe_client(sid)
+    if job_filter.is_empty:
+        join_room(ALL_JOBS_ROOM, sid=sid)
+        return
+    room = FILTER_ROOM_PREFIX + hashlib.md5(job_filter.key.encode('utf-8')).hexdigest()
+    with subscriptions_lock:
+        entry = subscriptions.setdefault(room, [job_filter, 0])
+        entry[1] += 1
+        client_rooms[sid] = room
+        FILTER_ROOMS.set(len(subscriptions))
+    join_room(room, sid=sid)
+
+def unsubscribe_client(sid):
+    """Take a socket client out of whichever room it is in"""
+    leave_room(ALL_JOBS_ROOM, sid=sid)
+    with subscriptions_lock:
+        room = client_rooms.pop(sid, None)
+        if room is None:
+            return
+        entry = subscriptions[room]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del subscriptions[room]
+        FILTER_ROOMS.set(len(subscriptions))
+    leave_room(room, sid=sid)
+
+def client_jobs(sid):
+    """Jobs a socket client should see given its current filter"""
+    with subscriptions_lock:
+        room = client_rooms.get(sid)
+        job_filter = subscriptions[room][0] if room else None
+    return jobs_data if job_filter is None else job_filter.query(job_index)
+
+def get_stats():
+    """Calculate statistics from the job index"""
+    now = datetime.now()
+    today = datetime.combine(now.date(), datetime.min.time())
     
-    return stats
+    return {
+        "total": len(job_index),
+        "today": job_index.count_between(today.timestamp(), (today + timedelta(days=1)).timestamp()),
+        "thisWeek": job_index.count_between((now - timedelta(days=7)).timestamp()),
+        "withImages": job_index.with_images,
+        "byType": job_index.type_counts()
+    }
+
+def query_jobs(args):
+    """Apply the /api/jobs query-string filters using the job index"""
+    return JobFilter.from_dict(args).query(job_index)
 
 # ============================================================================
 # ROUTES
 # ============================================================================
 
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_latency(response):
+    """Observe request latency per route"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.labels(endpoint, request.method, response.status_code).observe(
+            time.perf_counter() - started)
+    return response
+
+@app.after_request
+def compress_response(response):
+    """Compress JSON bodies that weren't already encoded or streamed"""
+    response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype != 'application/json'
+            or response.content_length is None
+            or response.content_length < COMPRESSION_MIN_SIZE):
+        return response
+    encoding = preferred_encoding()
+    if encoding:
+        response.set_data(compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
 @app.route('/')
 def serve_index():
     """Serve the main HTML page"""
@@ -128,47 +410,38 @@ def get_jobs():
     date_to = request.args.get('dateTo')
     search = request.args.get('search', '').lower()
     job_type = request.args.get('type', 'all')
+    keywords = request.args.get('keywords')
     
-    filtered_jobs = jobs_data.copy()
+    if not (date_from or date_to or search or keywords) and job_type == 'all':
+        # Default dashboard view
+        return cached_json('jobs', lambda: {
+            "jobs": jobs_data,
+            "count": len(jobs_data),
+            "total": len(jobs_data)
+        })
     
-    # Apply filters
-    if date_from:
-        try:
-            date_from_obj = datetime.fromisoformat(date_from)
-            filtered_jobs = [j for j in filtered_jobs 
-                           if datetime.fromisoformat(j['date']) >= date_from_obj]
-        except:
-            pass
+    # Filtered results only change with the data, so the version is the tag
+    query_hash = hashlib.md5(request.query_string).hexdigest()[:16]
+    etag = f"{data_version}-{query_hash}"
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
     
-    if date_to:
-        try:
-            date_to_obj = datetime.fromisoformat(date_to)
-            filtered_jobs = [j for j in filtered_jobs 
-                           if datetime.fromisoformat(j['date']) <= date_to_obj]
-        except:
-            pass
-    
-    if search:
-        filtered_jobs = [
-            j for j in filtered_jobs 
-            if search in j.get('title', '').lower() 
-            or search in j.get('description', '').lower()
-            or search in j.get('company', '').lower()
-        ]
-    
-    if job_type != 'all':
-        filtered_jobs = [j for j in filtered_jobs if j.get('type') == job_type]
+    filtered_jobs = query_jobs(request.args)
     
-    return jsonify({
+    response = jsonify({
         "jobs": filtered_jobs,
         "count": len(filtered_jobs),
         "total": len(jobs_data)
     })
+    response.set_etag(etag)
+    return response
 
 @app.route('/api/jobs/<int:job_id>')
 def get_job(job_id):
     """Get a specific job by ID"""
-    job = next((j for j in jobs_data if j['id'] == job_id), None)
+    job = job_index.get(job_id)
     if job:
         return jsonify(job)
     return jsonify({"error": "Job not found"}), 404
@@ -176,7 +449,33 @@ def get_job(job_id):
 @app.route('/api/stats')
 def get_statistics():
     """Get statistics about jobs"""
-    return jsonify(get_stats())
+    return cached_json('stats', get_stats, ttl=STATS_CACHE_TTL)
+
+@app.route('/api/trends')
+def get_trends():
+    """Keyword, job-type or company counts over time
+
+    ?dimension=keyword|type|company, interval=day|hour, from/to as ISO
+    dates (default: the last 30 days or 48 hours) and either names=a,b
+    or top=N (default 10) for the most frequent names in the range.
+    """
+    dimension = request.args.get('dimension', 'keyword')
+    interval = request.args.get('interval', 'day')
+    end = parse_timestamp(request.args.get('to')) or time.time()
+    start = parse_timestamp(request.args.get('from'))
+    if start is None:
+        start = end - TREND_DEFAULT_SPAN.get(interval, TREND_DEFAULT_SPAN['day'])
+    names = [name.strip() for name in request.args.get('names', '').split(',') if name.strip()]
+    if dimension == 'keyword':
+        names = [name.lower() for name in names]
+    try:
+        top = int(request.args.get('top', 10))
+        result = trend_index.query(dimension, interval, start, end, names=names, top=top)
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 501
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(result)
 
 @app.route('/api/images/<path:filename>')
 def serve_image(filename):
@@ -193,20 +492,93 @@ def serve_image(filename):
 
 @app.route('/api/export')
 def export_jobs():
-    """Export all jobs as JSON"""
-    return jsonify(jobs_data)
+    """Export jobs matching the /api/jobs filters
+
+    ?format=ndjson (default) or csv streams the rows; parquet or arrow
+    writes a columnar file batch by batch and sends it.
+    """
+    fmt = request.args.get('format', 'ndjson').lower()
+    # Rows are produced as the response is written, not collected up front
+    jobs = JobFilter.from_dict(request.args).iter_query(job_index)
+    stamp = datetime.now().strftime('%Y-%m-%d')
+    headers = {'Content-Disposition': f'attachment; filename=jobs-{stamp}.{fmt}'}
+    
+    if fmt in exporters.STREAMING_FORMATS:
+        chunks = exporters.ndjson_lines(jobs) if fmt == 'ndjson' else exporters.csv_lines(jobs)
+        if 'gzip' in request.accept_encodings:
+            chunks = gzip_stream(chunks)
+            headers['Content-Encoding'] = 'gzip'
+        return app.response_class(chunks, mimetype=exporters.STREAMING_FORMATS[fmt], headers=headers)
+    
+    if fmt in exporters.FILE_FORMATS:
+        if exporters.pa is None:
+            return jsonify({"error": "pyarrow is required for Parquet/Arrow export (pip install pyarrow)"}), 501
+        # Columnar files need their footer written before sending
+        tmp = tempfile.NamedTemporaryFile(suffix=f'.{fmt}', delete=False)
+        tmp.close()
+        try:
+            exporters.write_columnar(jobs, tmp.name, fmt)
+        except Exception as e:
+            os.unlink(tmp.name)
+            return jsonify({"error": f"Export failed: {e}"}), 500
+        return app.response_class(stream_and_remove(tmp.name),
+                                  mimetype=exporters.FILE_FORMATS[fmt], headers=headers)
+    
+    return jsonify({"error": f"Unknown export format: {fmt}"}), 400
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics for this server plus the monitor's latest snapshot"""
+    body = registry.render()
+    try:
+        body += Path(MONITOR_METRICS_FILE).read_text(encoding='utf-8')
+    except OSError:
+        pass
+    return app.response_class(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/profile', methods=['GET', 'POST', 'DELETE'])
+def profile():
+    """Runtime sampling profiler: POST starts, DELETE stops and returns stacks
+
+    Output is in collapsed-stack format for flamegraph.pl / speedscope.
+    """
+    if request.method == 'POST':
+        try:
+            interval = float(request.args.get('interval', profiler.interval))
+        except ValueError:
+            return jsonify({"error": "interval must be a number of seconds"}), 400
+        if not math.isfinite(interval) or interval <= 0:
+            return jsonify({"error": "interval must be a positive number of seconds"}), 400
+        profiler.interval = max(interval, PROFILE_MIN_INTERVAL)
+        profiler.start()
+        return jsonify({"profiling": True, "interval": profiler.interval})
+    if request.method == 'DELETE':
+        return app.response_class(profiler.stop(), mimetype='text/plain')
+    return jsonify({"profiling": profiler.running, "interval": profiler.interval})
 
 # ============================================================================
 # WEBSOCKET EVENTS
 # ============================================================================
 
 @socketio.on('connect')
-def handle_connect():
-    """Handle WebSocket connection"""
+def handle_connect(auth=None):
+    """Handle WebSocket connection
+
+    Clients may pass {"filter": {...}} as connect auth to receive only
+    matching jobs from the start (and again after every reconnect).
+    """
     print(f"🔌 Client connected: {request.sid}")
+    CONNECTED_CLIENTS.inc()
+    requested = auth.get('filter') if isinstance(auth, dict) else None
+    try:
+        job_filter = JobFilter.from_dict(requested or {})
+    except ValueError:
+        # A malformed filter shouldn't cost the client its connection
+        job_filter = JobFilter()
+    subscribe_client(request.sid, job_filter)
     # Send current data to newly connected client
     emit('initial_data', {
-        'jobs': jobs_data,
+        'jobs': client_jobs(request.sid),
         'stats': get_stats(),
         'monitoring_status': monitoring_status
     })
@@ -215,12 +587,33 @@ def handle_connect():
 def handle_disconnect():
     """Handle WebSocket disconnection"""
     print(f"🔌 Client disconnected: {request.sid}")
+    CONNECTED_CLIENTS.inc(-1)
+    unsubscribe_client(request.sid)
+
+@socketio.on('subscribe_filter')
+def handle_subscribe_filter(data):
+    """Client sets its filter (type, dateFrom, dateTo, search, keywords)
+
+    Replies with the matching jobs; later updates carry only new matches.
+    An empty filter goes back to receiving every job. A malformed filter
+    is answered with filter_error and leaves the subscription unchanged.
+    """
+    try:
+        job_filter = JobFilter.from_dict(data or {})
+    except ValueError as e:
+        emit('filter_error', {'error': str(e)})
+        return
+    subscribe_client(request.sid, job_filter)
+    emit('filtered_data', {
+        'jobs': client_jobs(request.sid),
+        'stats': get_stats()
+    })
 
 @socketio.on('request_update')
 def handle_update_request():
     """Client requests data update"""
     emit('jobs_updated', {
-        'jobs': jobs_data,
+        'jobs': client_jobs(request.sid),
         'stats': get_stats()
     })
 
@@ -259,14 +652,26 @@ def initialize():
     
     # Load existing jobs
     load_jobs()
+    claim_broadcaster()
     
     print(f"✓ API Server initialized")
     print(f"✓ Loaded {len(jobs_data)} jobs")
+    print(f"✓ Server mode: {SERVER_MODE}")
+    if MESSAGE_QUEUE:
+        role = "broadcaster" if is_broadcaster else "follower"
+        print(f"✓ Message queue: {MESSAGE_QUEUE} ({role})")
     
     # Start file watcher in separate thread
     watcher_thread = threading.Thread(target=start_file_watcher, daemon=True)
     watcher_thread.start()
 
+def create_app():
+    """Entry point for production workers, e.g.
+    gunicorn -k eventlet -w 1 'api_server:create_app()'
+    """
+    initialize()
+    return app
+
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -285,10 +690,16 @@ if __name__ == '__main__':
     print(f"   GET  /api/jobs                - Get all jobs")
     print(f"   GET  /api/jobs/<id>           - Get specific job")
     print(f"   GET  /api/stats               - Get statistics")
-    print(f"   GET  /api/export              - Export jobs")
+    print(f"   GET  /api/export              - Export jobs (ndjson/csv/parquet/arrow)")
+    print(f"   GET  /api/trends              - Keyword/type/company counts over time")
     print(f"   GET  /api/images/<filename>   - Get job images")
+    print(f"   GET  /metrics                 - Prometheus metrics")
+    print(f"   POST /api/profile             - Start sampling profiler (DELETE stops)")
     print(f"\n💡 Tip: Open http://localhost:5000 in your browser")
     print(f"\nPress Ctrl+C to stop\n")
     
     # Run server with WebSocket support
-    socketio.run(app, host='0.0.0.0', port=5000, debug=False, allow_unsafe_werkzeug=True)
+    if SERVER_MODE == 'dev':
+        socketio.run(app, host='0.0.0.0', port=5000, debug=False, allow_unsafe_werkzeug=True)
+    else:
+        socketio.run(app, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=False)
@@ -0,0 +1,101 @@
+"""
+Memory Benchmark
+Feeds synthetic messages through the monitor's detection and storage path
+(no browser) and reports RSS, so long sessions can be checked for growth
+
+Usage:
+    python benchmarks/bench_memory.py --messages 100000
+    python benchmarks/bench_memory.py --messages 100000 --window 1000000   # effectively unbounded
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import monitor
+from bench_monitor import peak_rss_mb
+from job_store import JobStore, RecentSet
+
+ROLES = ['Python Developer', 'Backend Engineer', 'Data Analyst', 'DevOps Engineer',
+         'React Developer', 'QA Engineer', 'Network Administrator', 'ML Engineer']
+COMPANIES = ['Acme Ltd', 'Savannah Tech', 'Kilimanjaro Labs', 'Nairobi Cloud']
+TERMS = ['full-time', 'remote', 'contract', 'internship', 'part-time']
+CHATTER = ['Good morning everyone', 'Thanks for sharing!', 'Is this still open?',
+           'Happy Friday', 'Who is going to the meetup?', 'Congrats on the new role']
+
+
+def synthetic_messages(count: int, job_ratio: float, seed: int):
+    """Yield (message id, text) pairs resembling group traffic"""
+    rng = random.Random(seed)
+    for n in range(count):
+        if rng.random() < job_ratio:
+            text = (f"{rng.choice(COMPANIES)} is hiring a {rng.choice(ROLES)}. "
+                    f"{rng.choice(TERMS)} position, {rng.randint(1, 8)} years experience. "
+                    f"Send CV to jobs{n}@example.com")
+        else:
+            text = f"{rng.choice(CHATTER)} ({n})"
+        yield f"bench_{n}", text
+
+
+def current_rss_mb() -> float:
+    """Current resident set size in MB (Linux), else the peak"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="bench_memory_")
+    os.chdir(workdir)
+
+    job_monitor = monitor.WhatsAppJobMonitor("Benchmark Group", output_file="jobs_data.json")
+    job_monitor.jobs = JobStore("jobs_data.json", window=args.window)
+    job_monitor.processed_messages = RecentSet(args.processed)
+
+    baseline = current_rss_mb()
+    checkpoints = {args.messages * i // 4 for i in range(1, 5)}
+    started = time.perf_counter()
+
+    print("\n" + "="*60)
+    print("MEMORY BENCHMARK")
+    print("="*60)
+    print(f"Window: {args.window} jobs, processed-set cap: {args.processed}")
+    print(f"Baseline RSS: {baseline:.1f} MB\n")
+
+    for seen, (msg_id, text) in enumerate(synthetic_messages(args.messages, args.job_ratio, args.seed), 1):
+        if msg_id not in job_monitor.processed_messages and job_monitor.is_it_job(text):
+            job_monitor.jobs.append(job_monitor.create_job(text, "", False, ""))
+            job_monitor.processed_messages.add(msg_id)
+            job_monitor.save_jobs()
+        if seen in checkpoints:
+            print(f"{seen:>9} messages  {len(job_monitor.jobs):>8} jobs  RSS {current_rss_mb():7.1f} MB")
+
+    elapsed = time.perf_counter() - started
+    print(f"\nDuration:       {elapsed:.1f}s ({args.messages / elapsed:.0f} msg/s)")
+    print(f"Jobs in memory: {len(job_monitor.jobs.recent)} of {len(job_monitor.jobs)}")
+    print(f"Jobs file:      {os.path.getsize('jobs_data.json') / 1024 / 1024:.1f} MB")
+    print(f"Final RSS:      {current_rss_mb():.1f} MB (+{current_rss_mb() - baseline:.1f} MB)")
+    print(f"Peak RSS:       {peak_rss_mb():.1f} MB")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--job-ratio', type=float, default=0.3)
+    parser.add_argument('--window', type=int, default=monitor.MAX_JOBS_IN_MEMORY)
+    parser.add_argument('--processed', type=int, default=monitor.MAX_PROCESSED_MESSAGES)
+    parser.add_argument('--seed', type=int, default=1)
+    run(parser.parse_args())
@@ -0,0 +1,189 @@
+"""
+Monitor Benchmark
+Runs WhatsAppJobMonitor against a local fake WhatsApp Web page in headless
+Chrome and reports throughput, detection latency, OCR time and memory
+
+Usage:
+    python benchmarks/bench_monitor.py
+    python benchmarks/bench_monitor.py --initial 1000 --rate 20 --duration 60 --image-ratio 0.2
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from selenium import webdriver
+
+from load_test import percentile
+from monitor import WhatsAppJobMonitor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FAKE_PAGE = Path(__file__).resolve().parent / "fake_whatsapp.html"
+MARKER = re.compile(r'#bench-(\d+)')
+
+
+class BenchmarkMonitor(WhatsAppJobMonitor):
+    """Monitor that records timings for each stage it passes through"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.messages_seen = 0
+        self.ocr_times = []
+        self.classify_times = []
+        self.detected_at = {}  # bench message number -> detection time (ms since epoch)
+
+    def extract_text_from_image(self, image_path: str) -> str:
+        started = time.perf_counter()
+        text = super().extract_text_from_image(image_path)
+        self.ocr_times.append(time.perf_counter() - started)
+        return text
+
+    def is_it_job(self, text: str) -> bool:
+        self.messages_seen += 1
+        started = time.perf_counter()
+        result = super().is_it_job(text)
+        self.classify_times.append(time.perf_counter() - started)
+        return result
+
+    def analyze_job(self, text: str, image_text: str = "") -> dict:
+        # Only called for detected jobs, right before they are saved
+        match = MARKER.search(text)
+        if match:
+            self.detected_at.setdefault(int(match.group(1)), time.time() * 1000)
+        return super().analyze_job(text, image_text)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 if unavailable)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def create_driver(headless: bool):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--window-size=1280,900')
+    return webdriver.Chrome(options=options)
+
+
+def wait_for_page(driver, timeout: float = 60):
+    deadline = time.time() + timeout
+    while not driver.execute_script("return window.benchReady === true"):
+        if time.time() > deadline:
+            raise TimeoutError("fake WhatsApp page did not finish loading")
+        time.sleep(0.2)
+
+
+def ms(seconds_list, pct):
+    return percentile(sorted(seconds_list), pct) * 1000
+
+
+def report_stage(name, elapsed, processed, monitor, classify_from, ocr_from, traced_peak):
+    classify = monitor.classify_times[classify_from:]
+    ocr = monitor.ocr_times[ocr_from:]
+    print(f"\n{name}")
+    print("-"*60)
+    print(f"Duration:        {elapsed:.2f}s")
+    print(f"Messages:        {processed} ({processed / elapsed:.1f} msg/s)")
+    if classify:
+        print(f"Classification:  p50 {ms(classify, 50):.3f} ms  p99 {ms(classify, 99):.3f} ms")
+    if ocr:
+        print(f"OCR:             {len(ocr)} images  p50 {ms(ocr, 50):.0f} ms  p99 {ms(ocr, 99):.0f} ms")
+    if traced_peak is not None:
+        print(f"Python heap peak: {traced_peak / 1024 / 1024:.1f} MB")
+    print(f"Peak RSS:        {peak_rss_mb():.1f} MB")
+
+
+def run(args):
+    query = (f"initial={args.initial}&rate={args.rate}&jobRatio={args.job_ratio}"
+             f"&imageRatio={args.image_ratio}&seed={args.seed}")
+    url = f"{FAKE_PAGE.as_uri()}?{query}"
+
+    workdir = tempfile.mkdtemp(prefix="bench_monitor_")
+    os.chdir(workdir)  # monitor writes screenshots/ and the jobs file relative to cwd
+
+    monitor = BenchmarkMonitor("Benchmark Group", output_file="jobs_data.json")
+    monitor.driver = create_driver(not args.show_browser)
+    try:
+        monitor.driver.get(url)
+        wait_for_page(monitor.driver)
+
+        print("\n" + "="*60)
+        print("MONITOR BENCHMARK")
+        print("="*60)
+        print(f"Page:  {url}")
+        print(f"Files: {workdir}")
+
+        # Stage 1: history scan over the initial messages
+        if args.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        monitor.scan_existing_messages(scroll_passes=0)
+        scan_elapsed = time.perf_counter() - started
+        scan_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+        scan_seen = monitor.messages_seen
+        scan_ocr = len(monitor.ocr_times)
+        scan_classify = len(monitor.classify_times)
+        if args.trace_memory:
+            tracemalloc.reset_peak()
+
+        # Stage 2: live monitoring while the page keeps posting
+        started = time.perf_counter()
+        monitor.monitor_messages(poll_interval=args.poll_interval, duration=args.duration)
+        live_elapsed = time.perf_counter() - started
+        live_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+
+        created = monitor.driver.execute_script("return window.benchCreated")
+        generated_jobs = monitor.driver.execute_script("return window.benchJobs")
+    finally:
+        monitor.driver.quit()
+
+    report_stage("scan_existing_messages", scan_elapsed, scan_seen, monitor,
+                 0, 0, scan_peak)
+    report_stage("monitor_messages", live_elapsed, monitor.messages_seen - scan_seen, monitor,
+                 scan_classify, scan_ocr, live_peak)
+
+    live_jobs = [n for n in generated_jobs if n >= args.initial and created[n]]
+    latencies = [
+        (monitor.detected_at[n] - created[n]) / 1000
+        for n in live_jobs if n in monitor.detected_at
+    ]
+    print(f"\nDetection")
+    print("-"*60)
+    print(f"Live jobs posted:   {len(live_jobs)}")
+    print(f"Live jobs detected: {len(latencies)}")
+    if latencies:
+        print(f"Latency:            p50 {ms(latencies, 50):.0f} ms  p99 {ms(latencies, 99):.0f} ms")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--initial', type=int, default=200, help='messages already in the chat')
+    parser.add_argument('--rate', type=float, default=5, help='new messages per second')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of live monitoring')
+    parser.add_argument('--job-ratio', type=float, default=0.3)
+    parser.add_argument('--image-ratio', type=float, default=0.0,
+                        help='share of messages with an image (needs Tesseract)')
+    parser.add_argument('--poll-interval', type=float, default=2)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='track Python heap peaks with tracemalloc (slows the run)')
+    parser.add_argument('--show-browser', action='store_true')
+    run(parser.parse_args())
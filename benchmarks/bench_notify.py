@@ -0,0 +1,156 @@
+"""
+Notification Benchmark
+Runs a local HTTP stand-in for webhook/Telegram endpoints and measures
+fan-out of synthetic jobs to many keyword subscribers
+
+Usage:
+    python benchmarks/bench_notify.py --subscribers 20000 --jobs 50
+    python benchmarks/bench_notify.py --serve --port 8025     # stand-in only
+    python benchmarks/bench_notify.py --throttle-every 10     # every 10th request gets 429
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from load_test import percentile
+from notifier import NotificationDispatcher, Subscriber, SubscriberIndex
+
+KEYWORDS = ['python', 'java', 'react', 'aws', 'docker', 'sql', 'django', 'kubernetes',
+            'flutter', 'devops', 'data analyst', 'golang', 'php', 'azure', 'node.js', 'figma']
+TYPES = ['fulltime', 'remote', 'contract', 'parttime', 'internship']
+
+
+class SinkHandler(BaseHTTPRequestHandler):
+    """Accepts webhook and Telegram-style POSTs and counts what arrived"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+    stats = {'requests': 0, 'jobs': 0, 'throttled': 0, 'last_at': 0.0}
+    lock = threading.Lock()
+    throttle_every = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.lock:
+            self.stats['requests'] += 1
+            throttle = self.throttle_every and self.stats['requests'] % self.throttle_every == 0
+            if throttle:
+                self.stats['throttled'] += 1
+            else:
+                payload = json.loads(body or b'{}')
+                self.stats['jobs'] += len(payload.get('jobs', [])) or 1
+                self.stats['last_at'] = time.perf_counter()
+        if throttle:
+            self.send_response(429)
+            self.send_header('Retry-After', '0.5')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+def start_sink(port: int, throttle_every: int = 0):
+    SinkHandler.throttle_every = throttle_every
+    server = ThreadingHTTPServer(('127.0.0.1', port), SinkHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def synthetic_job(n: int, rng: random.Random) -> dict:
+    return {
+        "id": n,
+        "title": "Software Engineer",
+        "company": "Acme Ltd",
+        "type": rng.choice(TYPES),
+        "keywords": rng.sample(KEYWORDS, 3)
+    }
+
+
+def run(args):
+    server = start_sink(args.port, args.throttle_every)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    rng = random.Random(args.seed)
+
+    subscribers = [
+        Subscriber(f"sub{i}", 'webhook', f"{url}/hook/{i}",
+                   keywords=rng.sample(KEYWORDS, rng.randint(1, 3)),
+                   types=rng.sample(TYPES, 2) if rng.random() < 0.3 else ())
+        for i in range(args.subscribers)
+    ]
+    jobs = [synthetic_job(n, rng) for n in range(args.jobs)]
+
+    # Matching cost alone, via the inverted index
+    index = SubscriberIndex(subscribers)
+    started = time.perf_counter()
+    expected = sum(len(index.match(job)) for job in jobs)
+    match_elapsed = time.perf_counter() - started
+
+    dispatcher = NotificationDispatcher(subscribers, batch_size=args.batch_size,
+                                        batch_window=args.batch_window, rate=args.rate,
+                                        workers=args.workers).start()
+
+    submit_times = []
+    started = time.perf_counter()
+    for job in jobs:
+        t0 = time.perf_counter()
+        dispatcher.submit(job)
+        submit_times.append(time.perf_counter() - t0)
+    dispatcher.stop(timeout=args.timeout)
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    stats = SinkHandler.stats
+    submit_times.sort()
+    print("\n" + "="*60)
+    print("NOTIFICATION BENCHMARK")
+    print("="*60)
+    print(f"Subscribers:       {args.subscribers}")
+    print(f"Jobs:              {args.jobs}")
+    print(f"Matches:           {expected} ({match_elapsed / args.jobs * 1000:.2f} ms/job to match)")
+    print(f"submit() latency:  p50 {percentile(submit_times, 50) * 1e6:.1f} µs  "
+          f"max {submit_times[-1] * 1e6:.1f} µs")
+    print(f"Requests:          {stats['requests']} ({stats['throttled']} throttled with 429)")
+    print(f"Jobs delivered:    {stats['jobs']} of {expected}")
+    print(f"Fan-out time:      {elapsed:.2f}s ({stats['requests'] / elapsed:.0f} req/s)")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--serve', action='store_true', help='only run the stand-in endpoint')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--subscribers', type=int, default=20000)
+    parser.add_argument('--jobs', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--batch-window', type=float, default=2.0)
+    parser.add_argument('--rate', type=float, default=1.0, help='deliveries/sec per destination')
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--throttle-every', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.serve:
+        server = start_sink(args.port or 8025, args.throttle_every)
+        print(f"Stand-in listening on http://127.0.0.1:{server.server_address[1]} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(5)
+                print(SinkHandler.stats)
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        run(args)
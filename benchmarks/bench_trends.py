@@ -0,0 +1,127 @@
+"""
+Trend Analytics Benchmark
+Builds keyword/type/company rollups over months of synthetic jobs and
+times /api/trends-style queries against them
+
+Usage:
+    python benchmarks/bench_trends.py --jobs 200000 --days 180
+    python benchmarks/bench_trends.py --jobs 105000 --days 365 --companies 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_memory import current_rss_mb
+from job_index import JobIndex, parse_timestamp
+from load_test import percentile
+from trends import MAX_BUCKETS, TrendIndex, bucket_of
+
+KEYWORDS = ['python', 'java', 'react', 'aws', 'docker', 'sql', 'django', 'kubernetes',
+            'flutter', 'devops', 'data analyst', 'golang', 'php', 'azure', 'node.js', 'figma',
+            'machine learning', 'tensorflow', 'c#', 'angular', 'vue', 'linux', 'network', 'qa']
+TYPES = ['fulltime', 'remote', 'contract', 'parttime', 'internship']
+
+
+def synthetic_jobs(count: int, days: int, companies: int, seed: int) -> list:
+    """Jobs spread over the last `days` days, oldest first"""
+    rng = random.Random(seed)
+    start = datetime.now() - timedelta(days=days)
+    offsets = sorted(rng.uniform(0, days * 86400) for _ in range(count))
+    return [{
+        "id": n,
+        "title": "Software Engineer",
+        "company": f"Company {rng.randrange(companies)}",
+        "description": "",
+        "date": (start + timedelta(seconds=offset)).isoformat(),
+        "type": rng.choice(TYPES),
+        "keywords": rng.sample(KEYWORDS, rng.randint(1, 5))
+    } for n, offset in enumerate(offsets)]
+
+
+def time_query(trends: TrendIndex, repeat: int, **kwargs):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = trends.query(**kwargs)
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return result, percentile(samples, 50), percentile(samples, 99)
+
+
+def run(args):
+    jobs = synthetic_jobs(args.jobs, args.days, args.companies, args.seed)
+    index = JobIndex()
+    trends = TrendIndex()
+    baseline = current_rss_mb()
+
+    # Arrive in chunks, as the file watcher would see them
+    started = time.perf_counter()
+    for n in range(0, len(jobs), args.chunk):
+        index.sync(jobs[:n + args.chunk])
+        trends.sync(index)
+    build_elapsed = time.perf_counter() - started
+    rss = current_rss_mb()
+
+    # What a rewritten jobs file costs: recount everything in one go
+    rebuilt = TrendIndex()
+    started = time.perf_counter()
+    rebuilt.sync(index)
+    rebuild_elapsed = time.perf_counter() - started
+    entries = sum(rollup.size for rollup in trends.rollups.values())
+    rollup_mb = sum(rollup.buckets.nbytes + rollup.ids.nbytes + rollup.counts.nbytes
+                    for rollup in trends.rollups.values()) / 1024 / 1024
+
+    end = time.time()
+    start = end - args.days * 86400
+    queries = [
+        ("top 10 keywords, daily", dict(dimension='keyword', interval='day', start=start, end=end)),
+        ("top 10 keywords, hourly", dict(dimension='keyword', interval='hour', start=start, end=end)),
+        ("types, daily", dict(dimension='type', interval='day', start=start, end=end)),
+        ("top 20 companies, daily", dict(dimension='company', interval='day', start=start, end=end, top=20)),
+        ("python vs java, hourly", dict(dimension='keyword', interval='hour', start=start, end=end,
+                                        names=['python', 'java'])),
+        ("top 10 companies, hourly", dict(dimension='company', interval='hour',
+                                          start=end - (MAX_BUCKETS - 1) * 3600, end=end))
+    ]
+
+    print("\n" + "="*60)
+    print("TREND ANALYTICS BENCHMARK")
+    print("="*60)
+    print(f"Jobs:              {args.jobs} over {args.days} days, {args.companies} companies")
+    print(f"Incremental build: {build_elapsed:.2f}s including the job index "
+          f"({args.jobs / build_elapsed:.0f} jobs/s)")
+    print(f"Full recount:      {rebuild_elapsed:.2f}s")
+    print(f"Rollup entries:    {entries} in {rollup_mb:.1f} MB of arrays "
+          f"(RSS +{rss - baseline:.1f} MB incl. jobs and job index)")
+    for label, kwargs in queries:
+        result, p50, p99 = time_query(trends, args.repeat, **kwargs)
+        print(f"{label:<26} p50 {p50 * 1000:6.2f} ms  p99 {p99 * 1000:6.2f} ms  "
+              f"({len(result['buckets'])} buckets)")
+
+    # Cross-check one daily series against a direct count over the jobs
+    result = trends.query('keyword', 'day', start, end, names=['python'])
+    naive = Counter(bucket_of(parse_timestamp(job['date']), 'day')
+                    for job in jobs if 'python' in job['keywords'])
+    first = bucket_of(start, 'day')
+    expected = [naive.get(first + i, 0) for i in range(len(result['buckets']))]
+    print(f"Matches direct count: {result['series']['python'] == expected}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=200000)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--companies', type=int, default=500)
+    parser.add_argument('--chunk', type=int, default=1000, help='jobs per simulated file update')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    run(parser.parse_args())
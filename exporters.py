@@ -0,0 +1,101 @@
+"""
+Job Export Formats
+Streams jobs as NDJSON or CSV and writes columnar Parquet / Arrow files
+"""
+
+import csv
+import io
+import json
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Columns written by the tabular formats, in order
+EXPORT_COLUMNS = [
+    'id', 'title', 'company', 'description', 'date',
+    'hasImage', 'imageUrl', 'type', 'keywords'
+]
+BATCH_SIZE = 1000  # rows per Arrow record batch
+
+STREAMING_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+FILE_FORMATS = {
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.file'
+}
+
+
+def ndjson_lines(jobs):
+    """Yield one JSON document per job"""
+    for job in jobs:
+        yield json.dumps(job, ensure_ascii=False) + '\n'
+
+
+def csv_lines(jobs):
+    """Yield a CSV header followed by one row per job"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield flush()
+    for job in jobs:
+        row = [job.get(column, '') for column in EXPORT_COLUMNS]
+        row[EXPORT_COLUMNS.index('keywords')] = ';'.join(job.get('keywords', []))
+        writer.writerow(row)
+        yield flush()
+
+
+def arrow_schema():
+    """Arrow schema matching EXPORT_COLUMNS"""
+    return pa.schema([
+        ('id', pa.int64()),
+        ('title', pa.string()),
+        ('company', pa.string()),
+        ('description', pa.string()),
+        ('date', pa.string()),
+        ('hasImage', pa.bool_()),
+        ('imageUrl', pa.string()),
+        ('type', pa.string()),
+        ('keywords', pa.list_(pa.string()))
+    ])
+
+
+def record_batches(jobs, schema):
+    """Convert jobs to Arrow record batches of BATCH_SIZE rows"""
+    batch = []
+    for job in jobs:
+        batch.append({column: job.get(column) for column in EXPORT_COLUMNS})
+        if len(batch) >= BATCH_SIZE:
+            yield pa.RecordBatch.from_pylist(batch, schema=schema)
+            batch = []
+    if batch:
+        yield pa.RecordBatch.from_pylist(batch, schema=schema)
+
+
+def write_columnar(jobs, path: str, fmt: str):
+    """Write jobs to a Parquet or Arrow IPC file one batch at a time"""
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Parquet/Arrow export (pip install pyarrow)")
+
+    schema = arrow_schema()
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(path, schema, compression='snappy')
+    else:
+        writer = pa.ipc.new_file(path, schema)
+    try:
+        for batch in record_batches(jobs, schema):
+            writer.write_batch(batch)
+    finally:
+        writer.close()
@@ -0,0 +1,311 @@
+"""
+In-memory query index over the jobs list
+Answers the API's filters without scanning every job on each request
+"""
+
+import json
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+
+TOKEN_PATTERN = re.compile(r'\w+')
+MAX_CACHED_FRAGMENTS = 512  # search fragments whose token matches are kept
+
+
+def tokenize(text: str) -> set:
+    """Split lowercased text into word tokens"""
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def parse_timestamp(value):
+    """Parse an ISO date string to a POSIX timestamp, or None if invalid"""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class JobIndex:
+    """Secondary indexes over a list of job dicts
+
+    - by_id:       id -> job
+    - dates:       sorted (timestamp, seq) pairs for bisect range queries
+    - by_type:     type -> set of seqs
+    - by_keyword:  detected keyword -> set of seqs
+    - tokens:      word token -> set of seqs (inverted index for search)
+
+    Every job gets a sequence number in arrival order so results can be
+    returned in the same order as the jobs file. generation changes on
+    every rebuild, so callers can tell an append from a reload.
+
+    One thread may sync() while others query: appends and reads share a
+    lock, and a rebuild is indexed aside and swapped in under it.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        self.generation += 1
+        self.jobs = []
+        self.by_id = {}
+        self.dates = []
+        self.by_type = {}
+        self.by_keyword = {}
+        self.tokens = {}
+        self.with_images = 0
+        self._haystacks = []
+        self._token_matches = {}
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add(self, job: dict):
+        """Index one new job"""
+        with self._lock:
+            self._add(job)
+
+    def _add(self, job: dict):
+        # Everything that can fail on a malformed job runs before the first
+        # write, so a job is never left half-indexed
+        timestamp = parse_timestamp(job.get('date'))
+        job_type = job.get('type', 'unknown')
+        keywords = {keyword.lower() for keyword in job.get('keywords', ())}
+        haystack = '\x00'.join((
+            job.get('title', '').lower(),
+            job.get('description', '').lower(),
+            job.get('company', '').lower()
+        ))
+        tokens = tokenize(haystack)
+
+        seq = len(self.jobs)
+        self.jobs.append(job)
+        self.by_id[job.get('id')] = job
+        if timestamp is not None:
+            # New jobs are usually the latest, so this is normally an append
+            insort(self.dates, (timestamp, seq))
+        self.by_type.setdefault(job_type, set()).add(seq)
+        for keyword in keywords:
+            self.by_keyword.setdefault(keyword, set()).add(seq)
+        if job.get('hasImage'):
+            self.with_images += 1
+        self._haystacks.append(haystack)
+        for token in tokens:
+            self.tokens.setdefault(token, set()).add(seq)
+        # Keep cached partial-word matches current instead of rescanning
+        # the whole vocabulary on the next search
+        for fragment, seqs in self._token_matches.items():
+            if any(fragment in token for token in tokens):
+                seqs.add(seq)
+
+    def sync(self, jobs: list):
+        """Bring the index up to date with a freshly loaded jobs list
+
+        The monitor only ever appends, so when the known jobs are still an
+        unchanged prefix of the new list only the tail is indexed. Anything
+        else, including an edit to a known job, triggers a full rebuild.
+        Returns True if the index changed.
+        """
+        known = len(self.jobs)
+        is_append = len(jobs) >= known and all(old == new for old, new in zip(self.jobs, jobs))
+        if is_append:
+            with self._lock:
+                for job in jobs[known:]:
+                    self._add(job)
+            return len(jobs) > known
+
+        # Index the new list without the lock so readers keep the old one
+        # meanwhile, then swap it in at once
+        rebuilt = JobIndex()
+        for job in jobs:
+            rebuilt._add(job)
+        with self._lock:
+            generation = self.generation + 1
+            lock = self._lock
+            self.__dict__.update(rebuilt.__dict__)
+            self.generation, self._lock = generation, lock
+        return True
+
+    def get(self, job_id):
+        """Look up a job by id"""
+        with self._lock:
+            return self.by_id.get(job_id)
+
+    def count_between(self, start=None, end=None) -> int:
+        """Number of jobs dated in [start, end) where bounds are timestamps"""
+        with self._lock:
+            lo = 0 if start is None else bisect_left(self.dates, (start,))
+            hi = len(self.dates) if end is None else bisect_left(self.dates, (end,))
+        return max(0, hi - lo)
+
+    def type_counts(self) -> dict:
+        """Number of jobs per job type"""
+        with self._lock:
+            return {job_type: len(seqs) for job_type, seqs in self.by_type.items()}
+
+    def _date_range(self, date_from, date_to) -> set:
+        """Seqs of jobs dated within [date_from, date_to] (inclusive)"""
+        lo = 0 if date_from is None else bisect_left(self.dates, (date_from,))
+        hi = len(self.dates) if date_to is None else bisect_right(self.dates, (date_to, float('inf')))
+        return {seq for _, seq in self.dates[lo:hi]}
+
+    def _tokens_containing(self, fragment: str) -> set:
+        """Seqs of jobs with a word containing fragment (cached per fragment)"""
+        seqs = self._token_matches.get(fragment)
+        if seqs is None:
+            seqs = set()
+            for token, postings in self.tokens.items():
+                if fragment in token:
+                    seqs |= postings
+            if len(self._token_matches) >= MAX_CACHED_FRAGMENTS:
+                # Drop the oldest fragment so add() stays cheap
+                del self._token_matches[next(iter(self._token_matches))]
+            self._token_matches[fragment] = seqs
+        return seqs
+
+    def _search_candidates(self, search: str):
+        """Superset of seqs whose text contains search, or None to scan all
+
+        A substring match implies every query word appears inside some word
+        of the job text, so intersecting those postings never drops a hit.
+        """
+        fragments = TOKEN_PATTERN.findall(search)
+        if not fragments:
+            return None
+        candidates = None
+        for fragment in sorted(fragments, key=len, reverse=True):
+            seqs = self._tokens_containing(fragment)
+            candidates = seqs if candidates is None else candidates & seqs
+            if not candidates:
+                break
+        return candidates
+
+    def query(self, date_from=None, date_to=None, search='', job_type='all', keywords=()) -> list:
+        """Jobs matching every given filter, in arrival order
+
+        date_from/date_to are timestamps, search is a lowercased substring
+        of title, description or company, job_type 'all' disables the filter
+        and keywords keeps jobs tagged with any of the given keywords.
+        """
+        return list(self.iter_query(date_from, date_to, search, job_type, keywords))
+
+    def iter_query(self, date_from=None, date_to=None, search='', job_type='all', keywords=()):
+        """Like query(), but yields the jobs one at a time
+
+        Candidates are chosen up front, under the lock, as a sorted list of
+        seqs into the current job list, so a reload while the caller is
+        still iterating doesn't affect the result.
+        """
+        with self._lock:
+            jobs, haystacks = self.jobs, self._haystacks
+            seqs = self._candidates(date_from, date_to, search, job_type, keywords)
+        return (jobs[seq] for seq in seqs if not search or search in haystacks[seq])
+
+    def _candidates(self, date_from, date_to, search, job_type, keywords) -> list:
+        candidate_sets = []
+        if date_from is not None or date_to is not None:
+            candidate_sets.append(self._date_range(date_from, date_to))
+        if job_type != 'all':
+            candidate_sets.append(self.by_type.get(job_type, set()))
+        if keywords:
+            candidate_sets.append(set().union(*(self.by_keyword.get(kw, set()) for kw in keywords)))
+        if search:
+            candidates = self._search_candidates(search)
+            if candidates is not None:
+                candidate_sets.append(candidates)
+
+        if not candidate_sets:
+            return range(len(self.jobs))
+        # Start from the smallest set so the work tracks the result size
+        candidate_sets.sort(key=len)
+        seqs = candidate_sets[0]
+        for other in candidate_sets[1:]:
+            seqs = seqs & other
+            if not seqs:
+                return []
+        return sorted(seqs)
+
+
+class JobFilter:
+    """A client's subscription filter, normalized so equal filters share a key
+
+    Built from the same fields as the /api/jobs query string (type,
+    dateFrom, dateTo, search) plus a list of keywords.
+    """
+
+    __slots__ = ('job_type', 'date_from', 'date_to', 'search', 'keywords', 'key')
+
+    def __init__(self, job_type='all', date_from=None, date_to=None, search='', keywords=()):
+        self.job_type = job_type or 'all'
+        self.date_from = date_from
+        self.date_to = date_to
+        self.search = (search or '').lower()
+        self.keywords = tuple(sorted({kw.strip().lower() for kw in keywords if kw.strip()}))
+        self.key = json.dumps([self.job_type, self.date_from, self.date_to, self.search, self.keywords])
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a filter from client-supplied fields
+
+        Raises ValueError unless data is a mapping; fields of the wrong
+        type are ignored, as are non-string keywords.
+        """
+        if not hasattr(data, 'get'):
+            raise ValueError("filter must be an object")
+
+        def text(field, default=''):
+            value = data.get(field)
+            return value if isinstance(value, str) else default
+
+        keywords = data.get('keywords') or ()
+        if isinstance(keywords, str):
+            keywords = keywords.split(',')
+        elif not isinstance(keywords, (list, tuple)):
+            keywords = ()
+        return cls(
+            job_type=text('type', 'all'),
+            date_from=parse_timestamp(text('dateFrom') or None),
+            date_to=parse_timestamp(text('dateTo') or None),
+            search=text('search'),
+            keywords=[kw for kw in keywords if isinstance(kw, str)]
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return (self.job_type == 'all' and self.date_from is None and self.date_to is None
+                and not self.search and not self.keywords)
+
+    def query(self, index: JobIndex) -> list:
+        """All jobs in the index that pass this filter"""
+        return index.query(self.date_from, self.date_to, self.search, self.job_type, self.keywords)
+
+    def iter_query(self, index: JobIndex):
+        """Jobs in the index that pass this filter, yielded one at a time"""
+        return index.iter_query(self.date_from, self.date_to, self.search, self.job_type, self.keywords)
+
+    def matches(self, job: dict) -> bool:
+        """Whether a single (new) job passes this filter"""
+        if self.job_type != 'all' and job.get('type', 'unknown') != self.job_type:
+            return False
+        if self.date_from is not None or self.date_to is not None:
+            timestamp = parse_timestamp(job.get('date'))
+            if timestamp is None:
+                return False
+            if self.date_from is not None and timestamp < self.date_from:
+                return False
+            if self.date_to is not None and timestamp > self.date_to:
+                return False
+        if self.keywords and not any(kw.lower() in self.keywords for kw in job.get('keywords', ())):
+            return False
+        if self.search:
+            haystack = '\x00'.join((
+                job.get('title', '').lower(),
+                job.get('description', '').lower(),
+                job.get('company', '').lower()
+            ))
+            if self.search not in haystack:
+                return False
+        return True
@@ -0,0 +1,156 @@
+"""
+Bounded Job Storage
+Compact job records, a capped in-memory window backed by the jobs file,
+and a bounded set for remembering processed messages
+"""
+
+import json
+import os
+import sys
+from collections import OrderedDict, deque
+from pathlib import Path
+
+TAIL_READ_SIZE = 4096  # bytes read from the end of the jobs file when appending
+
+
+class JobRecord:
+    """One detected job, stored with __slots__ and interned keywords"""
+
+    __slots__ = ('id', 'title', 'company', 'description', 'date', 'has_image',
+                 'image_url', 'type', 'keywords', 'full_text')
+
+    def __init__(self, id, title, company, description, date, has_image=False,
+                 image_url="", type="fulltime", keywords=(), full_text=""):
+        self.id = id
+        self.title = title
+        self.company = company
+        self.description = description
+        self.date = date
+        self.has_image = has_image
+        self.image_url = image_url
+        self.type = sys.intern(type)
+        # Keywords repeat across thousands of jobs, so share the strings
+        self.keywords = tuple(sys.intern(kw) for kw in keywords)
+        self.full_text = full_text
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            id=data.get('id'),
+            title=data.get('title', ''),
+            company=data.get('company', ''),
+            description=data.get('description', ''),
+            date=data.get('date', ''),
+            has_image=data.get('hasImage', False),
+            image_url=data.get('imageUrl', ''),
+            type=data.get('type', 'unknown'),
+            keywords=data.get('keywords', ()),
+            full_text=data.get('full_text', '')
+        )
+
+    def to_dict(self) -> dict:
+        """Dict in the jobs_data.json / API format"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "company": self.company,
+            "description": self.description,
+            "date": self.date,
+            "hasImage": self.has_image,
+            "imageUrl": self.image_url,
+            "type": self.type,
+            "keywords": list(self.keywords),
+            "full_text": self.full_text
+        }
+
+
+class JobStore:
+    """Jobs file plus a rolling window of the most recent jobs in memory
+
+    Older jobs live only on disk. New jobs are appended to the end of the
+    JSON array in place, so saving costs the size of the new jobs rather
+    than rewriting the whole history.
+    """
+
+    def __init__(self, path: str, window: int = 1000):
+        self.path = path
+        self.recent = deque(maxlen=window)
+        self.count = 0
+        self._unsaved = []
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.recent)
+
+    def append(self, record: JobRecord):
+        self.recent.append(record)
+        self._unsaved.append(record)
+        self.count += 1
+
+    def load(self):
+        """Load the job count and the most recent window from the jobs file"""
+        self.recent.clear()
+        self._unsaved = []
+        self.count = 0
+        if not Path(self.path).exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            jobs = json.load(f)
+        self.count = len(jobs)
+        self.recent.extend(JobRecord.from_dict(job) for job in jobs[-self.recent.maxlen:])
+
+    def save(self):
+        """Append jobs added since the last save to the jobs file"""
+        if not self._unsaved:
+            return
+        entries = ',\n'.join(
+            '  ' + json.dumps(record.to_dict(), ensure_ascii=False) for record in self._unsaved
+        ).encode('utf-8')
+
+        if not Path(self.path).exists() or os.path.getsize(self.path) == 0:
+            with open(self.path, 'wb') as f:
+                f.write(b'[\n' + entries + b'\n]')
+        else:
+            with open(self.path, 'r+b') as f:
+                size = f.seek(0, os.SEEK_END)
+                tail_start = max(0, size - TAIL_READ_SIZE)
+                f.seek(tail_start)
+                tail = f.read().rstrip()
+                if not tail.endswith(b']'):
+                    raise ValueError(f"{self.path} is not a JSON array")
+                body = tail[:-1].rstrip()
+                separator = b'\n' if body.endswith(b'[') else b',\n'
+                # Overwrite the closing bracket and re-close after the new entries
+                f.seek(tail_start + len(body))
+                f.write(separator + entries + b'\n]')
+                f.truncate()
+        self._unsaved = []
+
+
+class RecentSet:
+    """Set that forgets its oldest members beyond maxlen (LRU on access)"""
+
+    def __init__(self, maxlen: int = 10000):
+        self.maxlen = maxlen
+        self._items = OrderedDict()
+
+    def __contains__(self, item):
+        if item in self._items:
+            self._items.move_to_end(item)
+            return True
+        return False
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        """Members from least to most recently used"""
+        return iter(self._items)
+
+    def add(self, item):
+        self._items[item] = None
+        self._items.move_to_end(item)
+        if len(self._items) > self.maxlen:
+            self._items.popitem(last=False)
@@ -0,0 +1,100 @@
+"""
+Load Test Harness
+Hammers the API server with concurrent clients and reports latency percentiles
+
+Usage:
+    python load_test.py --clients 500 --requests 20
+    python load_test.py --url http://localhost:5000 --paths /api/jobs,/api/stats
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlparse
+
+
+async def fetch(host: str, port: int, path: str) -> int:
+    """Send one GET request and return the HTTP status code"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            f"Connection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        # Drain the body so the timing covers the full response
+        while await reader.read(65536):
+            pass
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def client(host, port, paths, count, latencies, errors):
+    """One simulated dashboard client issuing requests back to back"""
+    for i in range(count):
+        path = paths[i % len(paths)]
+        started = time.perf_counter()
+        try:
+            status = await fetch(host, port, path)
+            if status >= 400:
+                errors.append(status)
+                continue
+            latencies.append(time.perf_counter() - started)
+        except Exception as e:
+            errors.append(type(e).__name__)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, int(round(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def run(url, clients, requests_per_client, paths):
+    parsed = urlparse(url)
+    host = parsed.hostname or 'localhost'
+    port = parsed.port or 80
+    latencies = []
+    errors = []
+
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        client(host, port, paths, requests_per_client, latencies, errors)
+        for _ in range(clients)
+    ])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print("\n" + "="*60)
+    print("LOAD TEST RESULTS")
+    print("="*60)
+    print(f"Target:      {url} {','.join(paths)}")
+    print(f"Clients:     {clients}")
+    print(f"Requests:    {len(latencies) + len(errors)} ({len(errors)} errors)")
+    print(f"Duration:    {elapsed:.2f}s")
+    print(f"Throughput:  {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(f"p50:         {percentile(latencies, 50) * 1000:.1f} ms")
+        print(f"p99:         {percentile(latencies, 99) * 1000:.1f} ms")
+        print(f"mean:        {statistics.mean(latencies) * 1000:.1f} ms")
+        print(f"max:         {latencies[-1] * 1000:.1f} ms")
+    if errors:
+        print(f"Error kinds: {sorted(set(map(str, errors)))}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=20, help='requests per client')
+    parser.add_argument('--paths', default='/api/jobs,/api/stats')
+    args = parser.parse_args()
+
+    asyncio.run(run(args.url, args.clients, args.requests, args.paths.split(',')))
@@ -3,27 +3,110 @@ WhatsApp IT Job Monitor - Complete Backend
 Monitors WhatsApp Web for ALL IT-related job postings
 """
 
+import os
 import time
 import json
+import hashlib
 import re
+import signal
 from datetime import datetime
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, InvalidSessionIdException,
+    NoSuchWindowException, WebDriverException
+)
 import pytesseract
 from PIL import Image
 import requests
+from metrics import Registry, SamplingProfiler
+from job_store import JobRecord, JobStore, RecentSet
+from supervisor import SessionLost, SessionSupervisor
+from notifier import NotificationDispatcher, load_subscribers
+
+MESSAGE_SELECTOR = 'div[class*="message-"]'
+CONVERSATION_SELECTOR = '[data-testid="conversation-panel-body"]'  # optional, only used to scroll history
+CHAT_LIST_SELECTOR = '[data-testid="chat-list"], #pane-side'
+QR_CODE_SELECTOR = '[data-testid="qrcode"], canvas[aria-label*="Scan"]'
+IMAGE_SELECTOR = 'img[src*="blob:"], img[src*="http"]'
+# JS body identifying message element `m` when it has no text: WhatsApp's
+# data-id on the message row, else the image source
+MEDIA_IDENTITY_JS = (
+    "const row = m.closest('[data-id]') || m.querySelector('[data-id]');"
+    "if (row) return 'id:' + row.getAttribute('data-id');"
+    "const img = m.querySelector(arguments[1]);"
+    "return img ? 'img:' + img.getAttribute('src') : '';"
+)
+# Session health
+CHECKPOINT_FILE = "monitor_checkpoint.json"
+HEARTBEAT_INTERVAL = 15  # seconds between DOM heartbeats
+MAX_LOOP_ERRORS = 3  # consecutive loop errors before checking the session
+RECONNECT_TIMEOUT = 60  # seconds to wait for chats after a restart
+# Memory bounds for long-running sessions
+MAX_JOBS_IN_MEMORY = 1000  # older jobs are only kept in the jobs file
+MAX_PROCESSED_MESSAGES = 10000
+CHECKPOINT_RECENT_MESSAGES = 2000  # message keys saved so restarts don't re-add jobs
+
+# Metrics are written to a file the API server exposes on /metrics
+METRICS_FILE = "monitor_metrics.prom"
+METRICS_WRITE_INTERVAL = 5  # seconds
+PROFILE_FILE = "monitor_profile.txt"
+
+registry = Registry()
+STAGE_SECONDS = registry.histogram(
+    'monitor_stage_seconds', 'Time spent in each monitor stage', ['stage'])
+MESSAGES_SEEN = registry.counter(
+    'monitor_messages_seen', 'Messages examined', ['phase'])
+JOBS_DETECTED = registry.counter(
+    'monitor_jobs_detected', 'IT jobs detected', ['phase'])
+PENDING_MESSAGES = registry.gauge(
+    'monitor_pending_messages', 'New messages in the current poll still waiting for OCR/classification')
+POLL_LAG = registry.histogram(
+    'monitor_poll_lag_seconds', 'How late each poll started relative to the poll interval')
+LAST_POLL = registry.gauge(
+    'monitor_last_poll_timestamp_seconds', 'Unix time of the most recent poll')
+
+def message_key(text: str) -> str:
+    """Stable id for a message, derived from its text (or media identity)"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+def xpath_literal(value: str) -> str:
+    """Quote a string as an XPath 1.0 literal (which has no escape sequences)"""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    # Both quote kinds: join single-quoted pieces with "'" via concat()
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+def is_session_error(error: Exception) -> bool:
+    """True if a WebDriver error means Chrome or the session is gone"""
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException, ConnectionError)):
+        return True
+    if type(error).__name__ in ('MaxRetryError', 'ProtocolError'):
+        # chromedriver itself is unreachable
+        return True
+    message = str(error).lower()
+    return isinstance(error, WebDriverException) and any(
+        hint in message for hint in ('disconnected', 'not reachable', 'session deleted', 'no such session')
+    )
 
 class WhatsAppJobMonitor:
     def __init__(self, group_name: str, output_file: str = "jobs_data.json"):
         self.group_name = group_name
         self.output_file = output_file
-        self.jobs = []
-        self.processed_messages = set()
+        self.jobs = JobStore(output_file, window=MAX_JOBS_IN_MEMORY)
+        self.processed_messages = RecentSet(MAX_PROCESSED_MESSAGES)
         self.driver = None
+        self.profiler = SamplingProfiler()
+        self.metrics_written_at = 0
+        self.checkpoint = None  # key of the last message handled
+        self.saved_checkpoint = None
+        self.last_poll_at = None
+        self.notifier = None  # NotificationDispatcher when subscribers exist
         
         # COMPREHENSIVE IT KEYWORDS - Catches ALL IT jobs
         self.it_keywords = [
@@ -151,8 +234,12 @@ class WhatsAppJobMonitor:
         Path("screenshots").mkdir(exist_ok=True)
         Path("extracted_images").mkdir(exist_ok=True)
         
-    def setup_driver(self):
-        """Setup Chrome WebDriver"""
+    def setup_driver(self, interactive: bool = True):
+        """Setup Chrome WebDriver
+
+        With interactive=False (reconnects), no prompts are shown: the saved
+        profile must still be logged in and chats must appear on their own.
+        """
         print("Setting up Chrome WebDriver...")
         
         options = webdriver.ChromeOptions()
@@ -188,6 +275,21 @@ class WhatsAppJobMonitor:
         
         self.driver.get('https://web.whatsapp.com')
         
+        if not interactive:
+            try:
+                WebDriverWait(self.driver, RECONNECT_TIMEOUT).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, CHAT_LIST_SELECTOR))
+                )
+                print("✓ WhatsApp Web reloaded from saved session")
+                time.sleep(3)
+                return True
+            except TimeoutException:
+                if self.driver.find_elements(By.CSS_SELECTOR, QR_CODE_SELECTOR):
+                    print("✗ Saved session logged out - QR code scan required")
+                else:
+                    print("✗ WhatsApp Web did not load chats in time")
+                return False
+        
         print("\n" + "="*60)
         print("SCAN QR CODE IN THE BROWSER WINDOW")
         print("="*60)
@@ -249,8 +351,12 @@ class WhatsAppJobMonitor:
             print("   python monitor.py")
             return False
     
-    def open_group(self):
-        """Open WhatsApp group"""
+    def open_group(self, interactive: bool = True):
+        """Open WhatsApp group
+
+        With interactive=False the search result matching the group name is
+        clicked automatically instead of asking the user.
+        """
         print(f"\nSearching for group: {self.group_name}")
         
         try:
@@ -266,6 +372,18 @@ class WhatsAppJobMonitor:
             search_input.send_keys(self.group_name)
             time.sleep(3)  # Wait for search results
             
+            if not interactive:
+                result = WebDriverWait(self.driver, 10).until(
+                    EC.element_to_be_clickable((By.XPATH, f'//span[@title={xpath_literal(self.group_name)}]'))
+                )
+                result.click()
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, MESSAGE_SELECTOR))
+                )
+                print("✓ Group reopened!")
+                time.sleep(2)
+                return True
+            
             print("\n" + "="*60)
             print("MANUAL GROUP SELECTION")
             print("="*60)
@@ -289,6 +407,10 @@ class WhatsAppJobMonitor:
     
     def is_it_job(self, text: str) -> bool:
         """Check if message is an IT job posting"""
+        with STAGE_SECONDS.labels('classify').time():
+            return self._matches_keywords(text)
+    
+    def _matches_keywords(self, text: str) -> bool:
         text_lower = text.lower()
         
         # Check for job keywords
@@ -303,8 +425,9 @@ class WhatsAppJobMonitor:
     def extract_text_from_image(self, image_path: str) -> str:
         """Extract text from image using OCR"""
         try:
-            img = Image.open(image_path)
-            text = pytesseract.image_to_string(img)
+            with STAGE_SECONDS.labels('ocr').time():
+                img = Image.open(image_path)
+                text = pytesseract.image_to_string(img)
             return text
         except Exception as e:
             print(f"Error extracting text: {e}")
@@ -363,13 +486,118 @@ class WhatsAppJobMonitor:
         """Download image from message"""
         try:
             img_path = f"screenshots/job_{message_id}.png"
-            img_element.screenshot(img_path)
+            with STAGE_SECONDS.labels('screenshot').time():
+                img_element.screenshot(img_path)
             return img_path
         except Exception as e:
             print(f"Error downloading image: {e}")
             return ""
     
-    def scan_existing_messages(self):
+    def create_job(self, text: str, image_text: str, has_image: bool, image_path: str) -> JobRecord:
+        """Build the record for a detected job"""
+        analysis = self.analyze_job(text, image_text)
+        return JobRecord(
+            id=len(self.jobs) + 1,
+            title=analysis["title"],
+            company=analysis["company"],
+            description=text[:500],
+            date=datetime.now().isoformat(),
+            has_image=has_image,
+            image_url=image_path if has_image else "",
+            type=analysis["type"],
+            keywords=analysis["keywords"],
+            full_text=f"{text}\n{image_text}"[:1000]
+        )
+    
+    def count_messages(self) -> int:
+        """Number of messages in the open chat, without fetching elements"""
+        return self.driver.execute_script(
+            "return document.querySelectorAll(arguments[0]).length", MESSAGE_SELECTOR)
+    
+    def messages_after(self, index: int) -> list:
+        """Only the message elements from index onwards"""
+        return self.driver.execute_script(
+            "return Array.from(document.querySelectorAll(arguments[0])).slice(arguments[1])",
+            MESSAGE_SELECTOR, index)
+    
+    def media_identity(self, msg) -> str:
+        """Identity of a message without text (see MEDIA_IDENTITY_JS)"""
+        try:
+            return self.driver.execute_script(
+                f"const m = arguments[0]; {MEDIA_IDENTITY_JS}", msg, IMAGE_SELECTOR) or ""
+        except Exception:
+            return ""
+    
+    def process_message(self, msg, msg_id: str, phase: str):
+        """Extract, OCR and classify one message element
+
+        Returns the new job if the message is an unseen IT job, else None.
+        """
+        MESSAGES_SEEN.labels(phase).inc()
+        
+        # Extract text
+        text = ""
+        try:
+            text_elem = msg.find_element(By.CSS_SELECTOR, 'span.selectable-text')
+            text = text_elem.text
+        except Exception:
+            pass
+        
+        # Image-only posts are keyed too, so they are checked before any OCR
+        identity = text or self.media_identity(msg)
+        if identity:
+            key = message_key(identity)
+            if key in self.processed_messages:
+                return None
+            self.processed_messages.add(key)
+            self.checkpoint = key
+        elif phase == 'history':
+            return None
+        
+        # Check for images
+        image_path = ""
+        image_text = ""
+        has_image = False
+        
+        try:
+            img = msg.find_element(By.CSS_SELECTOR, IMAGE_SELECTOR)
+            image_path = self.download_image(img, msg_id)
+            if image_path:
+                has_image = True
+                image_text = self.extract_text_from_image(image_path)
+                if phase != 'history':
+                    print(f"📷 Image extracted")
+        except Exception:
+            pass
+        
+        # Check if IT job
+        if not self.is_it_job(f"{text}\n{image_text}"):
+            return None
+        
+        JOBS_DETECTED.labels(phase).inc()
+        # Dated now, since the original post time isn't available
+        job = self.create_job(text, image_text, has_image, image_path)
+        self.jobs.append(job)
+        if self.notifier and phase != 'history':
+            # Queued for a background thread, never blocks the scrape loop
+            self.notifier.submit(job)
+        return job
+    
+    def scroll_history(self, scroll_passes: int):
+        """Scroll the chat up to make WhatsApp load older messages"""
+        try:
+            chat_container = self.driver.find_element(By.CSS_SELECTOR, CONVERSATION_SELECTOR)
+            
+            # Scroll up multiple times to load history
+            for i in range(scroll_passes):  # More passes load more messages
+                self.driver.execute_script("arguments[0].scrollTop = 0", chat_container)
+                time.sleep(1)
+                print(f"Scrolling... {i+1}/{scroll_passes}")
+            return True
+        except Exception:
+            return False
+    
+    def scan_existing_messages(self, scroll_passes: int = 10):
         """Scan all existing messages in the group (history)"""
         print("\n" + "="*60)
         print("SCANNING EXISTING MESSAGES...")
@@ -377,95 +605,95 @@ class WhatsAppJobMonitor:
         print("Scrolling to load all messages...")
         
         # Scroll up to load older messages
-        try:
-            chat_container = self.driver.find_element(By.CSS_SELECTOR, '[data-testid="conversation-panel-body"]')
-            
-            # Scroll up multiple times to load history
-            for i in range(10):  # Scroll 10 times to load more messages
-                self.driver.execute_script("arguments[0].scrollTop = 0", chat_container)
-                time.sleep(1)
-                print(f"Scrolling... {i+1}/10")
-        except:
+        if not self.scroll_history(scroll_passes):
             print("⚠️  Could not scroll, will scan visible messages only")
         
         print("\nScanning all visible messages for IT jobs...")
         
         # Get all messages
         try:
-            messages = self.driver.find_elements(By.CSS_SELECTOR, 'div[class*="message-"]')
+            with STAGE_SECONDS.labels('dom_scan').time():
+                messages = self.driver.find_elements(By.CSS_SELECTOR, MESSAGE_SELECTOR)
             print(f"Found {len(messages)} messages to scan\n")
             
-            scanned = 0
-            for msg in messages:
+            found = 0
+            for scanned, msg in enumerate(messages):
                 try:
-                    msg_id = f"history_{scanned}"
-                    
-                    if msg_id in self.processed_messages:
-                        continue
-                    
-                    # Extract text
-                    text = ""
-                    try:
-                        text_elem = msg.find_element(By.CSS_SELECTOR, 'span.selectable-text')
-                        text = text_elem.text
-                    except:
-                        pass
-                    
-                    if not text:
-                        continue
-                    
-                    # Check for images
-                    image_path = ""
-                    image_text = ""
-                    has_image = False
-                    
-                    try:
-                        img = msg.find_element(By.CSS_SELECTOR, 'img[src*="blob:"], img[src*="http"]')
-                        image_path = self.download_image(img, msg_id)
-                        if image_path:
-                            has_image = True
-                            image_text = self.extract_text_from_image(image_path)
-                    except:
-                        pass
-                    
-                    full_text = f"{text}\n{image_text}"
-                    
-                    # Check if IT job
-                    if self.is_it_job(full_text):
-                        print(f"🎯 Found IT job: {text[:50]}...")
-                        
-                        analysis = self.analyze_job(text, image_text)
-                        
-                        job_entry = {
-                            "id": len(self.jobs) + 1,
-                            "title": analysis["title"],
-                            "company": analysis["company"],
-                            "description": text[:500],
-                            "date": datetime.now().isoformat(),  # Using current time since we can't get original
-                            "hasImage": has_image,
-                            "imageUrl": image_path if has_image else "",
-                            "type": analysis["type"],
-                            "keywords": analysis["keywords"],
-                            "full_text": full_text[:1000]
-                        }
-                        
-                        self.jobs.append(job_entry)
-                        self.processed_messages.add(msg_id)
-                    
-                    scanned += 1
-                except Exception as e:
+                    job = self.process_message(msg, f"history_{scanned}", 'history')
+                    if job:
+                        found += 1
+                        print(f"🎯 Found IT job: {job.description[:50]}...")
+                except Exception:
                     continue
             
             self.save_jobs()
+            self.save_checkpoint()
+            self.write_metrics(force=True)
             print(f"\n✓ Scan complete!")
-            print(f"✓ Found {len(self.jobs)} IT jobs in history")
-            print(f"✓ Scanned {scanned} messages\n")
+            print(f"✓ Found {found} IT jobs in history ({len(self.jobs)} total)")
+            print(f"✓ Scanned {len(messages)} messages\n")
             
         except Exception as e:
             print(f"Error scanning messages: {e}")
     
-    def monitor_messages(self):
-        """Monitor group messages"""
+    def backfill(self, scroll_passes: int = 10):
+        """Process messages posted after the saved checkpoint
+
+        Used after a reconnect or warm restart. If the checkpoint isn't in
+        the loaded messages, older history is loaded until it is; failing
+        that, every visible message is processed. Messages whose keys were
+        saved with the checkpoint are skipped, so jobs aren't added twice.
+        """
+        print("\n⏪ Backfilling messages since last checkpoint...")
+        start = None
+        for attempt in range(scroll_passes + 1):
+            identities = self.driver.execute_script(
+                "return Array.from(document.querySelectorAll(arguments[0])).map(m => {"
+                "const t = m.querySelector('span.selectable-text');"
+                "if (t && t.innerText) return t.innerText;"
+                f"{MEDIA_IDENTITY_JS} }})",
+                MESSAGE_SELECTOR, IMAGE_SELECTOR)
+            keys = [message_key(identity) if identity else None for identity in identities]
+            if self.checkpoint in keys:
+                start = len(keys) - keys[::-1].index(self.checkpoint)
+                break
+            if attempt < scroll_passes:
+                self.scroll_history(1)
+        
+        if start is None:
+            print("⚠️  Checkpoint not found in loaded history, scanning all visible messages")
+            start = 0
+        
+        new_messages = self.messages_after(start)
+        found = 0
+        for position, msg in enumerate(new_messages):
+            try:
+                if self.process_message(msg, f"backfill_{int(time.time()*1000)}_{position}", 'backfill'):
+                    found += 1
+            except Exception:
+                continue
+        
+        self.save_jobs()
+        self.save_checkpoint()
+        print(f"✓ Backfilled {len(new_messages)} messages, {found} new IT jobs")
+    
+    def session_alive(self) -> bool:
+        """DOM heartbeat: WebDriver answers, messages are visible, no QR code
+
+        Checks only what the poll loop itself depends on.
+        """
+        try:
+            return bool(self.driver.execute_script(
+                "return !!document.querySelector(arguments[0]) && !document.querySelector(arguments[1])",
+                MESSAGE_SELECTOR, QR_CODE_SELECTOR))
+        except Exception:
+            return False
+    
+    def monitor_messages(self, poll_interval: float = 2, duration: float = None):
+        """Monitor group messages (forever, or for duration seconds)
+
+        Raises SessionLost when Chrome dies or WhatsApp Web logs out.
+        """
         print("\n" + "="*60)
         print("MONITORING NEW MESSAGES - DETECTING ALL IT JOBS")
         print("="*60)
@@ -475,101 +703,150 @@ class WhatsAppJobMonitor:
         print("Press Ctrl+C to stop\n")
         
         # Get current message count after scanning history
-        last_count = len(self.driver.find_elements(By.CSS_SELECTOR, 'div[class*="message-"]'))
+        last_count = self.count_messages()
+        deadline = time.time() + duration if duration else None
+        last_poll = None
+        last_heartbeat = time.time()
+        consecutive_errors = 0
         
         try:
-            while True:
+            while deadline is None or time.time() < deadline:
                 try:
-                    messages = self.driver.find_elements(By.CSS_SELECTOR, 'div[class*="message-"]')
+                    poll_started = time.time()
+                    if last_poll is not None:
+                        POLL_LAG.observe(max(0.0, poll_started - last_poll - poll_interval))
+                    last_poll = poll_started
+                    
+                    if poll_started - last_heartbeat >= HEARTBEAT_INTERVAL:
+                        last_heartbeat = poll_started
+                        if not self.session_alive():
+                            raise SessionLost("heartbeat failed: messages gone or logged out")
+                    
+                    with STAGE_SECONDS.labels('dom_scan').time():
+                        message_count = self.count_messages()
                     
-                    if len(messages) > last_count:
-                        new_messages = messages[last_count:]
+                    if message_count > last_count:
+                        with STAGE_SECONDS.labels('dom_scan').time():
+                            new_messages = self.messages_after(last_count)
                         
-                        for msg in new_messages:
+                        for position, msg in enumerate(new_messages):
+                            PENDING_MESSAGES.set(len(new_messages) - position)
                             try:
                                 msg_id = f"{int(time.time()*1000)}_{len(self.jobs)}"
-                                
-                                if msg_id in self.processed_messages:
-                                    continue
-                                
-                                # Extract text
-                                text = ""
-                                try:
-                                    text_elem = msg.find_element(By.CSS_SELECTOR, 'span.selectable-text')
-                                    text = text_elem.text
-                                except:
-                                    pass
-                                
-                                # Check for images
-                                image_path = ""
-                                image_text = ""
-                                has_image = False
-                                
-                                try:
-                                    img = msg.find_element(By.CSS_SELECTOR, 'img[src*="blob:"], img[src*="http"]')
-                                    image_path = self.download_image(img, msg_id)
-                                    if image_path:
-                                        has_image = True
-                                        image_text = self.extract_text_from_image(image_path)
-                                        print(f"📷 Image extracted")
-                                except:
-                                    pass
-                                
-                                full_text = f"{text}\n{image_text}"
-                                
-                                # Check if IT job
-                                if self.is_it_job(full_text):
-                                    print(f"\n🎯 IT JOB DETECTED!")
-                                    print(f"Preview: {text[:80]}...")
-                                    
-                                    analysis = self.analyze_job(text, image_text)
-                                    
-                                    job_entry = {
-                                        "id": len(self.jobs) + 1,
-                                        "title": analysis["title"],
-                                        "company": analysis["company"],
-                                        "description": text[:500],
-                                        "date": datetime.now().isoformat(),
-                                        "hasImage": has_image,
-                                        "imageUrl": image_path if has_image else "",
-                                        "type": analysis["type"],
-                                        "keywords": analysis["keywords"],
-                                        "full_text": full_text[:1000]
-                                    }
-                                    
-                                    self.jobs.append(job_entry)
-                                    self.processed_messages.add(msg_id)
+                                job = self.process_message(msg, msg_id, 'live')
+                                if job:
                                     self.save_jobs()
-                                    
-                                    print(f"✓ Saved: {analysis['title']} at {analysis['company']}")
+                                    print(f"\n🎯 IT JOB DETECTED!")
+                                    print(f"Preview: {job.description[:80]}...")
+                                    print(f"✓ Saved: {job.title} at {job.company}")
                                     print(f"Total: {len(self.jobs)} jobs\n")
                             except Exception as e:
                                 continue
                         
-                        last_count = len(messages)
+                        # Messages may have arrived between counting and fetching
+                        last_count += len(new_messages)
+                        PENDING_MESSAGES.set(0)
+                        self.save_checkpoint()
                     
-                    time.sleep(2)
+                    consecutive_errors = 0
+                    self.last_poll_at = poll_started
+                    LAST_POLL.set(poll_started)
+                    self.write_metrics()
+                    time.sleep(poll_interval)
+                except SessionLost:
+                    raise
                 except Exception as e:
+                    if is_session_error(e):
+                        raise SessionLost(str(e)) from e
+                    consecutive_errors += 1
                     print(f"Error in loop: {e}")
+                    if consecutive_errors >= MAX_LOOP_ERRORS and not self.session_alive():
+                        raise SessionLost(f"{consecutive_errors} consecutive errors: {e}") from e
                     time.sleep(5)
         except KeyboardInterrupt:
-            print("\n\n" + "="*60)
-            print("MONITORING STOPPED")
-            print(f"Total IT jobs found: {len(self.jobs)}")
-            print(f"Saved to: {self.output_file}")
-            print("="*60)
+            pass
+        
+        print("\n\n" + "="*60)
+        print("MONITORING STOPPED")
+        print(f"Total IT jobs found: {len(self.jobs)}")
+        print(f"Saved to: {self.output_file}")
+        print("="*60)
+    
+    def quit_driver(self):
+        """Close Chrome, ignoring errors from an already dead session"""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+    
+    def save_checkpoint(self):
+        """Persist the last handled message so restarts can resume from it
+
+        The most recent message keys are saved too, so a restarted monitor
+        still recognises messages it has already handled.
+        """
+        if not self.checkpoint or self.checkpoint == self.saved_checkpoint:
+            return
+        recent = list(self.processed_messages)[-CHECKPOINT_RECENT_MESSAGES:]
+        tmp_path = f"{CHECKPOINT_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "group": self.group_name,
+                "last_message": self.checkpoint,
+                "recent_messages": recent,
+                "updated_at": datetime.now().isoformat()
+            }, f)
+        os.replace(tmp_path, CHECKPOINT_FILE)
+        self.saved_checkpoint = self.checkpoint
+    
+    def load_checkpoint(self):
+        """Load the checkpoint saved for this group, if any"""
+        if not Path(CHECKPOINT_FILE).exists():
+            return
+        try:
+            with open(CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('group') == self.group_name:
+            self.checkpoint = self.saved_checkpoint = data.get('last_message')
+            for key in data.get('recent_messages', []):
+                self.processed_messages.add(key)
+            print(f"✓ Resuming after checkpoint from {data.get('updated_at')}")
     
     def save_jobs(self):
         """Save jobs to file"""
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.jobs, f, indent=2, ensure_ascii=False)
+        with STAGE_SECONDS.labels('save').time():
+            self.jobs.save()
+    
+    def write_metrics(self, force: bool = False):
+        """Publish metrics for the API server's /metrics endpoint"""
+        now = time.time()
+        if not force and now - self.metrics_written_at < METRICS_WRITE_INTERVAL:
+            return
+        try:
+            registry.write(METRICS_FILE)
+            self.metrics_written_at = now
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+    
+    def toggle_profiler(self, *_):
+        """Start or stop the sampling profiler (bound to SIGUSR1)"""
+        if self.profiler.running:
+            with open(PROFILE_FILE, 'w', encoding='utf-8') as f:
+                f.write(self.profiler.stop())
+            print(f"\n🔬 Profiler stopped, stacks written to {PROFILE_FILE}")
+        else:
+            self.profiler.start()
+            print("\n🔬 Profiler started (send SIGUSR1 again to stop)")
     
     def load_existing_jobs(self):
         """Load existing jobs"""
         if Path(self.output_file).exists():
-            with open(self.output_file, 'r', encoding='utf-8') as f:
-                self.jobs = json.load(f)
-                print(f"✓ Loaded {len(self.jobs)} existing jobs")
+            self.jobs.load()
+            print(f"✓ Loaded {len(self.jobs)} existing jobs")
     
     def run(self):
         """Main run function"""
@@ -578,24 +855,23 @@ class WhatsAppJobMonitor:
         print("="*60 + "\n")
         
         self.load_existing_jobs()
+        self.load_checkpoint()
         
-        if not self.setup_driver():
-            return
+        if hasattr(signal, 'SIGUSR1'):
+            # kill -USR1 <pid> toggles profiling without restarting
+            signal.signal(signal.SIGUSR1, self.toggle_profiler)
+        
+        subscribers = load_subscribers()
+        if subscribers:
+            self.notifier = NotificationDispatcher(subscribers, registry).start()
+            print(f"✓ Notifying {len(subscribers)} subscribers")
         
         try:
-            if not self.open_group():
-                print("Failed to open group")
-                return
-            
-            # First, scan all existing messages (history)
-            self.scan_existing_messages()
-            
-            # Then start monitoring new messages
-            self.monitor_messages()
+            # The supervisor restarts Chrome and resumes if the session dies
+            SessionSupervisor(self, registry).run()
         finally:
-            if self.driver:
-                self.driver.quit()
-
+            if self.notifier:
+                self.notifier.stop()
 
 if __name__ == "__main__":
     # CONFIGURE THIS - Your WhatsApp group name (NO EMOJIS!)
@@ -0,0 +1,343 @@
+"""
+Job Notifications
+Fans detected jobs out to subscribers over webhooks, Telegram and email,
+with keyword matching, batching, per-destination rate limits and retries
+"""
+
+import heapq
+import itertools
+import json
+import os
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import Registry
+
+SUBSCRIBERS_FILE = "subscribers.json"
+TELEGRAM_API_URL = os.environ.get('TELEGRAM_API_URL', 'https://api.telegram.org')
+TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN', '')
+SMTP_HOST = os.environ.get('SMTP_HOST', 'localhost')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', 25))
+SMTP_FROM = os.environ.get('SMTP_FROM', 'jobs@localhost')
+REQUEST_TIMEOUT = 10  # seconds
+
+
+class DeliveryError(Exception):
+    """A delivery failed; retry_after (seconds) is set when the server asked to back off"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Subscriber:
+    """Someone to notify, with optional keyword and job-type filters"""
+
+    __slots__ = ('id', 'channel', 'target', 'keywords', 'types')
+
+    def __init__(self, id, channel, target, keywords=(), types=()):
+        self.id = id
+        self.channel = channel
+        self.target = target
+        self.keywords = frozenset(kw.lower() for kw in keywords)
+        self.types = frozenset(types)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data['id'], data.get('channel', 'webhook'), data['target'],
+                   data.get('keywords', ()), data.get('types', ()))
+
+
+def load_subscribers(path: str = SUBSCRIBERS_FILE) -> list:
+    """Read subscribers from a JSON list, or return [] if the file is missing"""
+    if not Path(path).exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Subscriber.from_dict(item) for item in json.load(f)]
+
+
+class SubscriberIndex:
+    """Inverted index from keyword to the subscribers interested in it
+
+    Matching a job touches only the postings for its own keywords, so the
+    cost does not grow with the total number of subscribers.
+    """
+
+    def __init__(self, subscribers=()):
+        self.by_keyword = {}
+        self.match_all = []  # subscribers without a keyword filter
+        for subscriber in subscribers:
+            self.add(subscriber)
+
+    def add(self, subscriber: Subscriber):
+        if not subscriber.keywords:
+            self.match_all.append(subscriber)
+        for keyword in subscriber.keywords:
+            self.by_keyword.setdefault(keyword, []).append(subscriber)
+
+    def match(self, job: dict) -> list:
+        """Subscribers whose filters accept this job (each once)"""
+        matched = {}
+        for keyword in job.get('keywords', ()):
+            for subscriber in self.by_keyword.get(keyword, ()):
+                matched[subscriber.id] = subscriber
+        for subscriber in self.match_all:
+            matched[subscriber.id] = subscriber
+        job_type = job.get('type')
+        return [s for s in matched.values() if not s.types or job_type in s.types]
+
+
+class TokenBucket:
+    """Allows rate events per second with bursts of up to burst"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def try_acquire(self, now: float) -> bool:
+        # now may predate a bucket created during the same flush
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = max(self.updated, now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+def describe_error(error: Exception) -> str:
+    """Loggable summary of a delivery error
+
+    Exceptions from requests embed the URL, which for Telegram contains
+    the bot token, so only our own messages are printed verbatim.
+    """
+    if isinstance(error, DeliveryError):
+        return str(error)
+    return type(error).__name__
+
+
+def format_summary(jobs: list) -> str:
+    """Plain-text summary of a batch of jobs"""
+    lines = [f"{len(jobs)} new IT job{'s' if len(jobs) != 1 else ''}:"]
+    for job in jobs:
+        lines.append(f"• {job.get('title')} at {job.get('company')} ({job.get('type')})")
+    return '\n'.join(lines)
+
+
+class NotificationDispatcher:
+    """Background fan-out of detected jobs to subscribers
+
+    submit() never blocks: jobs go onto a bounded queue and a dispatcher
+    thread matches them, batches them per subscriber, applies rate limits
+    and hands deliveries to a worker pool sharing pooled HTTP connections.
+    """
+
+    def __init__(self, subscribers, registry: Registry = None, batch_size: int = 20,
+                 batch_window: float = 2.0, rate: float = 1.0, burst: int = 5,
+                 max_retries: int = 3, workers: int = 16, queue_size: int = 10000):
+        self.index = SubscriberIndex(subscribers)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+
+        self.queue = queue.Queue(queue_size)
+        self.pending = {}  # subscriber id -> (subscriber, first queued at, jobs, rate limited)
+        self.buckets = {}  # destination -> TokenBucket
+        self.retries = []  # heap of (due, seq, subscriber, jobs, attempt)
+        self._retry_lock = threading.Lock()
+        self._seq = itertools.count()
+        self._in_flight = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notify")
+        self.senders = {
+            'webhook': self.send_webhook,
+            'telegram': self.send_telegram,
+            'email': self.send_email
+        }
+
+        registry = registry or Registry()
+        self.sent = registry.counter(
+            'notify_deliveries', 'Successful notification deliveries', ['channel'])
+        self.failed = registry.counter(
+            'notify_failures', 'Deliveries that failed after all retries', ['channel'])
+        self.dropped = registry.counter(
+            'notify_dropped_jobs', 'Jobs dropped because the notification queue was full')
+        self.rate_limited = registry.counter(
+            'notify_rate_limited', 'Batches held back by a destination rate limit')
+        self.delivery_seconds = registry.histogram(
+            'notify_delivery_seconds', 'Time for one delivery request', ['channel'])
+        self.queue_depth = registry.gauge(
+            'notify_queue_depth', 'Jobs waiting to be matched to subscribers')
+
+        self._stopping = threading.Event()
+        self._abandon = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="notify-dispatcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 30):
+        """Deliver everything queued (including retries), then shut down
+
+        Whatever is still undelivered after timeout seconds, such as a retry
+        waiting out a long Retry-After, is dropped.
+        """
+        self._stopping.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # The dispatcher must be gone before the pool stops taking work
+            self._abandon.set()
+            self._thread.join()
+            with self._retry_lock:
+                abandoned = len(self.retries) + len(self.pending)
+                self.retries.clear()
+            print(f"⚠ Notification shutdown timed out, dropped {abandoned} undelivered batches")
+        self.pool.shutdown(wait=True)
+        self.session.close()
+
+    def submit(self, job) -> bool:
+        """Queue a job for notification without blocking the caller"""
+        if hasattr(job, 'to_dict'):
+            job = job.to_dict()
+        try:
+            self.queue.put_nowait(job)
+            return True
+        except queue.Full:
+            self.dropped.inc()
+            return False
+
+    # ------------------------------------------------------------------
+    # Dispatcher thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while not self._abandon.is_set():
+            try:
+                job = self.queue.get(timeout=0.1)
+                self._enqueue(job)
+                # Drain whatever else arrived without waiting again
+                while True:
+                    self._enqueue(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            self.queue_depth.set(self.queue.qsize())
+
+            stopping = self._stopping.is_set()
+            now = time.monotonic()
+            self._requeue_due_retries(now)
+            self._flush(now, force=stopping)
+            if stopping and self.queue.empty() and not self.pending:
+                with self._retry_lock:
+                    if not self.retries and not self._in_flight:
+                        return
+
+    def _enqueue(self, job: dict):
+        now = time.monotonic()
+        for subscriber in self.index.match(job):
+            entry = self.pending.get(subscriber.id)
+            if entry is None:
+                self.pending[subscriber.id] = (subscriber, now, [job], False)
+            else:
+                entry[2].append(job)
+
+    def _flush(self, now: float, force: bool = False):
+        for subscriber_id, (subscriber, first_at, jobs, held) in list(self.pending.items()):
+            if not force and len(jobs) < self.batch_size and now - first_at < self.batch_window:
+                continue
+            destination = f"{subscriber.channel}:{subscriber.target}"
+            bucket = self.buckets.get(destination)
+            if bucket is None:
+                bucket = self.buckets[destination] = TokenBucket(self.rate, self.burst)
+            if not force and not bucket.try_acquire(now):
+                if not held:
+                    # Counted once per batch, not on every loop it waits
+                    self.rate_limited.inc()
+                    self.pending[subscriber_id] = (subscriber, first_at, jobs, True)
+                continue
+            batch, rest = jobs[:self.batch_size], jobs[self.batch_size:]
+            if rest:
+                self.pending[subscriber_id] = (subscriber, now, rest, False)
+            else:
+                del self.pending[subscriber_id]
+            self._submit_delivery(subscriber, batch, 0)
+
+    def _submit_delivery(self, subscriber: Subscriber, jobs: list, attempt: int):
+        with self._retry_lock:
+            self._in_flight += 1
+        self.pool.submit(self._deliver, subscriber, jobs, attempt)
+
+    def _requeue_due_retries(self, now: float):
+        due = []
+        with self._retry_lock:
+            while self.retries and self.retries[0][0] <= now:
+                due.append(heapq.heappop(self.retries))
+        for _, _, subscriber, jobs, attempt in due:
+            self._submit_delivery(subscriber, jobs, attempt)
+
+    # ------------------------------------------------------------------
+    # Worker threads
+    # ------------------------------------------------------------------
+
+    def _deliver(self, subscriber: Subscriber, jobs: list, attempt: int):
+        try:
+            sender = self.senders.get(subscriber.channel)
+            if sender is None:
+                raise DeliveryError(f"unknown channel {subscriber.channel!r}")
+            with self.delivery_seconds.labels(subscriber.channel).time():
+                sender(subscriber, jobs)
+            self.sent.labels(subscriber.channel).inc()
+        except Exception as e:
+            if attempt >= self.max_retries:
+                self.failed.labels(subscriber.channel).inc()
+                print(f"✗ {subscriber.channel} notification to {subscriber.id} failed: {describe_error(e)}")
+            else:
+                retry_after = getattr(e, 'retry_after', None)
+                delay = retry_after if retry_after is not None else 2 ** attempt
+                with self._retry_lock:
+                    heapq.heappush(self.retries, (time.monotonic() + delay, next(self._seq),
+                                                  subscriber, jobs, attempt + 1))
+        finally:
+            with self._retry_lock:
+                self._in_flight -= 1
+
+    def _post(self, url: str, payload: dict):
+        response = self.session.post(url, json=payload, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After')
+            raise DeliveryError("rate limited by destination",
+                                retry_after=float(retry_after) if retry_after else None)
+        if response.status_code >= 400:
+            raise DeliveryError(f"HTTP {response.status_code}")
+
+    def send_webhook(self, subscriber: Subscriber, jobs: list):
+        self._post(subscriber.target, {"subscriber": subscriber.id, "jobs": jobs})
+
+    def send_telegram(self, subscriber: Subscriber, jobs: list):
+        url = f"{TELEGRAM_API_URL}/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+        self._post(url, {"chat_id": subscriber.target, "text": format_summary(jobs)})
+
+    def send_email(self, subscriber: Subscriber, jobs: list):
+        message = EmailMessage()
+        message['Subject'] = f"{len(jobs)} new IT job{'s' if len(jobs) != 1 else ''}"
+        message['From'] = SMTP_FROM
+        message['To'] = subscriber.target
+        message.set_content(format_summary(jobs))
+        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=REQUEST_TIMEOUT) as smtp:
+            smtp.send_message(message)
@@ -0,0 +1,109 @@
+"""
+Session Supervisor
+Keeps a WhatsAppJobMonitor running across Chrome crashes and logouts by
+restarting the browser from the saved profile and backfilling missed messages
+"""
+
+import time
+
+from metrics import Registry
+
+MAX_BACKOFF = 300  # seconds between reconnect attempts at most
+
+
+class SessionLost(Exception):
+    """The browser session died or WhatsApp Web is no longer usable"""
+
+
+class SessionSupervisor:
+    """Runs the monitor and recovers it whenever a SessionLost is raised"""
+
+    def __init__(self, monitor, registry: Registry = None, max_backoff: float = MAX_BACKOFF):
+        self.monitor = monitor
+        self.max_backoff = max_backoff
+        registry = registry or Registry()
+        self.restarts = registry.counter(
+            'monitor_session_restarts', 'Browser sessions restarted after a failure')
+        self.downtime = registry.histogram(
+            'monitor_session_downtime_seconds', 'Time from the last good poll until monitoring resumed',
+            buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600))
+        self.recovery = registry.histogram(
+            'monitor_session_recovery_seconds', 'Time from detecting a dead session until monitoring resumed',
+            buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600))
+        self.up = registry.gauge('monitor_session_up', '1 while the browser session is healthy')
+
+    def start(self) -> bool:
+        """First start: interactive login and group selection, then catch up"""
+        monitor = self.monitor
+        if not monitor.setup_driver():
+            return False
+        if not monitor.open_group():
+            print("Failed to open group")
+            return False
+        if monitor.checkpoint:
+            # Warm restart: only process what arrived since the last run
+            monitor.backfill()
+        else:
+            # First run: scan all existing messages (history)
+            monitor.scan_existing_messages()
+        return True
+
+    def reconnect(self) -> bool:
+        """Restart Chrome with the saved profile and reopen the group, no prompts"""
+        monitor = self.monitor
+        monitor.quit_driver()
+        if not monitor.setup_driver(interactive=False):
+            return False
+        if not monitor.open_group(interactive=False):
+            return False
+        monitor.backfill()
+        return True
+
+    def recover(self, error: SessionLost):
+        """Retry reconnecting with exponential backoff until it works"""
+        detected_at = time.time()
+        last_good = self.monitor.last_poll_at or detected_at
+        self.up.set(0)
+        print("\n" + "="*60)
+        print(f"⚠️  SESSION LOST: {error}")
+        print("="*60)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            print(f"🔄 Reconnecting (attempt {attempt})...")
+            try:
+                if self.reconnect():
+                    break
+            except Exception as e:
+                print(f"✗ Reconnect failed: {e}")
+            delay = min(self.max_backoff, 2 ** attempt)
+            print(f"⏳ Retrying in {delay}s")
+            time.sleep(delay)
+
+        resumed_at = time.time()
+        self.restarts.inc()
+        self.downtime.observe(resumed_at - last_good)
+        self.recovery.observe(resumed_at - detected_at)
+        self.up.set(1)
+        self.monitor.write_metrics(force=True)
+        print(f"✓ Recovered after {resumed_at - detected_at:.0f}s "
+              f"(down {resumed_at - last_good:.0f}s since last good poll)")
+
+    def run(self):
+        """Start monitoring and keep it alive until Ctrl+C"""
+        try:
+            if not self.start():
+                return
+            self.up.set(1)
+            while True:
+                try:
+                    self.monitor.monitor_messages()
+                    return  # stopped by the user
+                except SessionLost as e:
+                    self.recover(e)
+        except KeyboardInterrupt:
+            print("\nStopped")
+        finally:
+            self.monitor.save_checkpoint()
+            self.monitor.quit_driver()
@@ -0,0 +1,249 @@
+"""
+Keyword Trend Analytics
+Hourly and daily rollups of keyword, job-type and company counts kept in
+NumPy arrays, so trend queries never touch individual jobs
+"""
+
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+
+from job_index import parse_timestamp
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DIMENSIONS = ('keyword', 'type', 'company')
+INTERVALS = ('hour', 'day')
+MAX_BUCKETS = 24 * 400  # longest series a single query may return
+INITIAL_ENTRIES = 1024
+
+
+def bucket_of(timestamp: float, interval: str) -> int:
+    """Bucket number of a timestamp: POSIX hours, or local calendar days"""
+    if interval == 'hour':
+        return int(timestamp // 3600)
+    return datetime.fromtimestamp(timestamp).toordinal()
+
+
+@lru_cache(maxsize=4 * MAX_BUCKETS)
+def bucket_label(bucket: int, interval: str) -> str:
+    """ISO label for a bucket number"""
+    if interval == 'hour':
+        return datetime.fromtimestamp(bucket * 3600).isoformat(timespec='minutes')
+    return date.fromordinal(bucket).isoformat()
+
+
+class Rollup:
+    """Sparse counts as parallel (bucket, name id, count) NumPy arrays
+
+    Only non-zero (bucket, name) pairs are stored, so memory follows the
+    number of distinct pairs seen rather than buckets x names. That matters
+    for free-text dimensions like company names, and for stray dates far
+    from the rest. Entries are kept sorted by bucket, so a time range is
+    found by binary search.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.compacted_size = 0
+        self.buckets = np.zeros(INITIAL_ENTRIES, dtype=np.int32)
+        self.ids = np.zeros(INITIAL_ENTRIES, dtype=np.int32)
+        self.counts = np.zeros(INITIAL_ENTRIES, dtype=np.int32)
+
+    def add_many(self, buckets, ids):
+        """Count one occurrence for each (buckets[i], ids[i]) pair"""
+        if not len(buckets):
+            return
+        # Pre-aggregate the batch: one entry per distinct pair, sorted by bucket
+        buckets, ids, counts = self._aggregate(buckets, ids, np.ones(len(buckets), dtype=np.int64))
+        in_order = self.size == 0 or buckets[0] >= self.buckets[self.size - 1]
+        self._append(buckets, ids, counts)
+        if not in_order or self.size > 2 * max(self.compacted_size, INITIAL_ENTRIES):
+            # Merge duplicate pairs from separate batches and restore ordering
+            self.compact()
+
+    def compact(self):
+        size = self.size
+        buckets, ids, counts = self._aggregate(
+            self.buckets[:size], self.ids[:size], self.counts[:size])
+        self.size = len(buckets)
+        self.buckets[:self.size] = buckets
+        self.ids[:self.size] = ids
+        self.counts[:self.size] = counts
+        self.compacted_size = self.size
+
+    @staticmethod
+    def _aggregate(buckets, ids, counts):
+        buckets = np.asarray(buckets, dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        keys = (buckets << 32) | ids
+        unique, inverse = np.unique(keys, return_inverse=True)
+        summed = np.bincount(inverse, weights=counts, minlength=len(unique)).astype(np.int64)
+        return unique >> 32, unique & 0xFFFFFFFF, summed
+
+    def _append(self, buckets, ids, counts):
+        needed = self.size + len(buckets)
+        if needed > len(self.buckets):
+            capacity = len(self.buckets)
+            while capacity < needed:
+                capacity *= 2
+            for name in ('buckets', 'ids', 'counts'):
+                grown = np.zeros(capacity, dtype=np.int32)
+                grown[:self.size] = getattr(self, name)[:self.size]
+                setattr(self, name, grown)
+        self.buckets[self.size:needed] = buckets
+        self.ids[self.size:needed] = ids
+        self.counts[self.size:needed] = counts
+        self.size = needed
+
+    def _range(self, first: int, last: int) -> slice:
+        buckets = self.buckets[:self.size]
+        return slice(np.searchsorted(buckets, first, 'left'), np.searchsorted(buckets, last, 'right'))
+
+    def totals(self, first: int, last: int, names: int):
+        """Total per name id over buckets first..last (inclusive)"""
+        span = self._range(first, last)
+        return np.bincount(self.ids[span], weights=self.counts[span], minlength=names).astype(np.int64)
+
+    def window(self, first: int, last: int, ids: list, names: int):
+        """Counts per bucket for the given name ids only, zero-filled"""
+        result = np.zeros((last - first + 1, len(ids)), dtype=np.int64)
+        if not ids:
+            return result
+        column = np.full(names, -1, dtype=np.int64)
+        column[ids] = np.arange(len(ids))
+        span = self._range(first, last)
+        columns = column[self.ids[span]]
+        wanted = columns >= 0
+        np.add.at(result, (self.buckets[span][wanted] - first, columns[wanted]),
+                  self.counts[span][wanted])
+        return result
+
+
+class TrendIndex:
+    """Incremental keyword / job-type / company rollups over the jobs list
+
+    sync() follows a JobIndex, so only jobs appended since the last call
+    are counted; a rebuilt index is recounted from scratch. Counting and
+    queries share a lock, and a recount is built aside and swapped in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.generation = None
+        self.names = {dimension: [] for dimension in DIMENSIONS}
+        self.ids = {dimension: {} for dimension in DIMENSIONS}
+        self.rollups = {}
+        if np is not None:
+            self.rollups = {(dimension, interval): Rollup()
+                            for dimension in DIMENSIONS for interval in INTERVALS}
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    def _id(self, dimension: str, name: str) -> int:
+        ids = self.ids[dimension]
+        name_id = ids.get(name)
+        if name_id is None:
+            name_id = ids[name] = len(self.names[dimension])
+            self.names[dimension].append(name)
+        return name_id
+
+    def add(self, job: dict):
+        """Count one job into every rollup"""
+        self.add_many([job])
+
+    def add_many(self, jobs):
+        """Count a batch of jobs, updating each rollup once"""
+        with self._lock:
+            self._add_many(jobs)
+
+    def _add_many(self, jobs):
+        entries = {dimension: ([], [], []) for dimension in DIMENSIONS}  # hours, days, ids
+        for job in jobs:
+            self.count += 1
+            timestamp = parse_timestamp(job.get('date'))
+            if timestamp is None or np is None:
+                continue
+            hour, day = bucket_of(timestamp, 'hour'), bucket_of(timestamp, 'day')
+            values = {
+                'keyword': {kw.lower() for kw in job.get('keywords', ())},
+                'type': {job.get('type', 'unknown')},
+                'company': {job.get('company') or 'Unknown Company'}
+            }
+            for dimension, names in values.items():
+                hours, days, ids = entries[dimension]
+                for name in names:
+                    hours.append(hour)
+                    days.append(day)
+                    ids.append(self._id(dimension, name))
+        if np is None:
+            return
+        for dimension, (hours, days, ids) in entries.items():
+            self.rollups[dimension, 'hour'].add_many(hours, ids)
+            self.rollups[dimension, 'day'].add_many(days, ids)
+
+    def sync(self, index):
+        """Catch up with a JobIndex (see JobIndex.generation)"""
+        if index.generation == self.generation:
+            self.add_many(index.jobs[self.count:])
+            return
+        # Recount without the lock so queries keep the old rollups meanwhile
+        rebuilt = TrendIndex()
+        rebuilt._add_many(index.jobs)
+        with self._lock:
+            self.count, self.names, self.ids, self.rollups = (
+                rebuilt.count, rebuilt.names, rebuilt.ids, rebuilt.rollups)
+            self.generation = index.generation
+
+    def query(self, dimension='keyword', interval='day', start=None, end=None,
+              names=None, top=10) -> dict:
+        """Per-bucket counts between two timestamps (inclusive)
+
+        Returns the series for the given names, or for the top names by
+        total count in the range when names is not given.
+        """
+        if not self.available:
+            raise RuntimeError("Trend analytics need numpy (pip install numpy)")
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {dimension}")
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown interval: {interval}")
+        first, last = bucket_of(start, interval), bucket_of(end, interval)
+        if last < first:
+            raise ValueError("Range ends before it starts")
+        if last - first + 1 > MAX_BUCKETS:
+            raise ValueError(f"Range spans more than {MAX_BUCKETS} {interval}s")
+
+        with self._lock:
+            known = self.names[dimension]
+            rollup = self.rollups[dimension, interval]
+            if names:
+                ids = [self.ids[dimension][name] for name in names if name in self.ids[dimension]]
+            else:
+                totals = rollup.totals(first, last, len(known))
+                top = min(top, int(np.count_nonzero(totals)))
+                ids = np.argsort(totals, kind='stable')[::-1][:top].tolist() if top > 0 else []
+            counts = rollup.window(first, last, ids, len(known))
+            labels = [known[i] for i in ids]
+        totals = counts.sum(axis=0)
+
+        return {
+            "dimension": dimension,
+            "interval": interval,
+            "buckets": [bucket_label(bucket, interval) for bucket in range(first, last + 1)],
+            "series": {name: counts[:, column].tolist() for column, name in enumerate(labels)},
+            "totals": {name: int(totals[column]) for column, name in enumerate(labels)}
+        }